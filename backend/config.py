@@ -3,11 +3,108 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _rate_limit(name: str, default: str):
+    # "<requests per second>,<burst>"
+    rate, burst = os.getenv(name, default).split(",")
+    return float(rate), int(burst)
+
 class Settings:
     duffel_api_key: str = os.getenv("DUFFEL_API_KEY", "")
     duffel_api_version: str = os.getenv("DUFFEL_API_VERSION", "v2")
     duffel_base_url: str = "https://api.duffel.com"
     duffel_timeout: int = 30
     api_client_secret: str = os.getenv("API_CLIENT_SECRET", "")
+    duffel_webhook_secret: str = os.getenv("DUFFEL_WEBHOOK_SECRET", "")
+    json_backend: str = os.getenv("JSON_BACKEND", "auto")
+
+    # Shared upstream connection pool
+    duffel_http2: bool = os.getenv("DUFFEL_HTTP2", "true").lower() == "true"
+    duffel_max_connections: int = int(os.getenv("DUFFEL_MAX_CONNECTIONS", "100"))
+    duffel_max_keepalive_connections: int = int(os.getenv("DUFFEL_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    duffel_keepalive_expiry: float = float(os.getenv("DUFFEL_KEEPALIVE_EXPIRY", "60"))
+    duffel_warmup_connections: int = int(os.getenv("DUFFEL_WARMUP_CONNECTIONS", "2"))
+
+    # Client-side throttling and retries
+    duffel_rate_limit_search = _rate_limit("DUFFEL_RATE_LIMIT_SEARCH", "5,20")
+    duffel_rate_limit_orders = _rate_limit("DUFFEL_RATE_LIMIT_ORDERS", "5,20")
+    duffel_rate_limit_payments = _rate_limit("DUFFEL_RATE_LIMIT_PAYMENTS", "2,10")
+    duffel_rate_limit_other = _rate_limit("DUFFEL_RATE_LIMIT_OTHER", "10,40")
+    duffel_rate_limit_max_wait: float = float(os.getenv("DUFFEL_RATE_LIMIT_MAX_WAIT", "10"))
+    duffel_max_retries: int = int(os.getenv("DUFFEL_MAX_RETRIES", "3"))
+    duffel_retry_base_delay: float = float(os.getenv("DUFFEL_RETRY_BASE_DELAY", "0.25"))
+    duffel_retry_max_delay: float = float(os.getenv("DUFFEL_RETRY_MAX_DELAY", "8"))
+
+    # Adaptive GET timeouts and hedged detail lookups
+    duffel_adaptive_timeouts: bool = os.getenv("DUFFEL_ADAPTIVE_TIMEOUTS", "true").lower() == "true"
+    duffel_min_timeout: float = float(os.getenv("DUFFEL_MIN_TIMEOUT", "2"))
+    duffel_timeout_multiplier: float = float(os.getenv("DUFFEL_TIMEOUT_MULTIPLIER", "3"))
+    duffel_hedging: bool = os.getenv("DUFFEL_HEDGING", "false").lower() == "true"
+    duffel_hedge_min_headroom: float = float(os.getenv("DUFFEL_HEDGE_MIN_HEADROOM", "0.5"))
+    latency_window: int = int(os.getenv("LATENCY_WINDOW", "200"))
+    latency_min_samples: int = int(os.getenv("LATENCY_MIN_SAMPLES", "20"))
+
+    # Downstream response compression
+    compression_minimum_size: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Multi-search fan-out
+    fan_out_concurrency: int = int(os.getenv("FAN_OUT_CONCURRENCY", "4"))
+    fan_out_max_searches: int = int(os.getenv("FAN_OUT_MAX_SEARCHES", "21"))
+
+    # Batch offer request event streams
+    batch_stream_max_seconds: float = float(os.getenv("BATCH_STREAM_MAX_SECONDS", "180"))
+
+    # Columnar offer index for local filter / sort
+    offer_index_max_requests: int = int(os.getenv("OFFER_INDEX_MAX_REQUESTS", "64"))
+    offer_index_max_ttl: float = float(os.getenv("OFFER_INDEX_MAX_TTL", "1800"))
+
+    # Background warm-up of top-ranked offers
+    prefetch_enabled: bool = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+    prefetch_top_offers: int = int(os.getenv("PREFETCH_TOP_OFFERS", "3"))
+    prefetch_concurrency: int = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+    prefetch_max_requests: int = int(os.getenv("PREFETCH_MAX_REQUESTS", "16"))
+    prefetch_min_headroom: float = float(os.getenv("PREFETCH_MIN_HEADROOM", "0.5"))
+
+    # Partial offer request selection-path cache
+    partial_offer_cache_max_requests: int = int(os.getenv("PARTIAL_OFFER_CACHE_MAX_REQUESTS", "64"))
+    partial_offer_cache_max_ttl: float = float(os.getenv("PARTIAL_OFFER_CACHE_MAX_TTL", "900"))
+    partial_offer_prefetch_siblings: int = int(os.getenv("PARTIAL_OFFER_PREFETCH_SIBLINGS", "4"))
+
+    # Shared order pollers behind bookings and /orders/{id}/wait
+    order_poll_interval: float = float(os.getenv("ORDER_POLL_INTERVAL", "0.5"))
+    order_poll_max_interval: float = float(os.getenv("ORDER_POLL_MAX_INTERVAL", "4"))
+
+    # In-process request multiplexing (/api/batch)
+    batch_max_requests: int = int(os.getenv("BATCH_MAX_REQUESTS", "50"))
+    batch_concurrency: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+    # Webhook event pipeline
+    webhook_signature_tolerance: float = float(os.getenv("WEBHOOK_SIGNATURE_TOLERANCE", "300"))
+    webhook_queue_size: int = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+    webhook_workers: int = int(os.getenv("WEBHOOK_WORKERS", "2"))
+    webhook_batch_size: int = int(os.getenv("WEBHOOK_BATCH_SIZE", "50"))
+    webhook_dedup_size: int = int(os.getenv("WEBHOOK_DEDUP_SIZE", "10000"))
+
+    # SQLite read model for orders, payments and cancellations
+    read_model_enabled: bool = os.getenv("READ_MODEL_ENABLED", "true").lower() == "true"
+    read_model_path: str = os.getenv("READ_MODEL_PATH", "duffel_read_model.db")
+    read_model_sync_interval: float = float(os.getenv("READ_MODEL_SYNC_INTERVAL", "15"))
+    read_model_max_staleness: float = float(os.getenv("READ_MODEL_MAX_STALENESS", "60"))
+    # Every Nth sync pages through everything, refreshing records changed upstream
+    read_model_full_sync_every: int = int(os.getenv("READ_MODEL_FULL_SYNC_EVERY", "20"))
+
+    # Background jobs for slow searches (?async=true)
+    job_concurrency: int = int(os.getenv("JOB_CONCURRENCY", "8"))
+    job_max_pending: int = int(os.getenv("JOB_MAX_PENDING", "100"))
+    job_result_ttl: float = float(os.getenv("JOB_RESULT_TTL", "900"))
+
+    # Multi-id bulk-get endpoints
+    bulk_get_max_ids: int = int(os.getenv("BULK_GET_MAX_IDS", "500"))
+    bulk_get_concurrency: int = int(os.getenv("BULK_GET_CONCURRENCY", "16"))
+
+    # Offer / seat map response cache
+    response_cache_max_bytes: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    response_cache_max_ttl: float = float(os.getenv("RESPONSE_CACHE_MAX_TTL", "900"))
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
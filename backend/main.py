@@ -1,17 +1,46 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routers import (
     offers, offer_requests, orders, payments, seat_maps,
     order_cancellations, order_changes, partial_offer_requests,
-    batch_offer_requests, airline_credits
+    batch_offer_requests, airline_credits, bookings, batch, webhooks, jobs
 )
 
+from backend.config import settings
+from backend.models.compact import interner
+from backend.middleware.compression import CompressionMiddleware, compression_stats
+from backend.services.duffel_client import duffel, start_http_client, close_http_client
+from backend.services.jobs import jobs as job_manager
+from backend.services.offer_index import offer_indexes
+from backend.services.order_waiter import order_waiter
+from backend.services.partial_offers import partial_offer_tree
+from backend.services.prefetch import prefetcher
+from backend.services.read_model import read_model
+from backend.services.response_cache import response_cache
+from backend.services.webhooks import webhook_pipeline
 from backend.utils.error_handlers import api_exception
+from backend.utils.json_codec import FastJSONResponse
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled, keep-alive upstream client for the whole process
+    await start_http_client()
+    await webhook_pipeline.start()
+    if settings.read_model_enabled:
+        await read_model.open()
+    yield
+    await webhook_pipeline.stop()
+    await job_manager.stop()
+    await read_model.close()
+    await close_http_client()
 
 app = FastAPI(
     title="Duffel Python API",
     description="Best-practice FastAPI backend for Duffel APIs.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 app.add_middleware(
@@ -21,6 +50,13 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality
+)
+
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
     print(f"{request.method} {request.url.path}")
@@ -32,6 +68,7 @@ def root():
         "message": "Duffel Python API",
         "endpoints": [
             "/api/health",
+            "/api/metrics",
             "/api/offers",
             "/api/offer-requests",
             "/api/orders",
@@ -41,7 +78,11 @@ def root():
             "/api/order-changes",
             "/api/partial-offer-requests",
             "/api/batch-offer-requests",
-            "/api/airline-credits"
+            "/api/airline-credits",
+            "/api/bookings",
+            "/api/batch",
+            "/api/webhooks/duffel",
+            "/api/jobs"
         ]
     }
 
@@ -50,6 +91,22 @@ def health():
     from datetime import datetime
     return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
 
+@app.get("/api/metrics")
+def metrics():
+    return {
+        "duffel": duffel.stats(),
+        "response_cache": response_cache.stats(),
+        "compression": compression_stats.stats(),
+        "offer_indexes": offer_indexes.stats(),
+        "interned_references": interner.stats(),
+        "prefetch": prefetcher.stats(),
+        "partial_offers": partial_offer_tree.stats(),
+        "order_waiters": order_waiter.stats(),
+        "webhooks": webhook_pipeline.stats(),
+        "read_model": read_model.stats(),
+        "jobs": job_manager.stats(),
+    }
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     return api_exception(exc)
@@ -64,4 +121,8 @@ app.include_router(order_cancellations.router, prefix="/api")
 app.include_router(order_changes.router, prefix="/api")
 app.include_router(partial_offer_requests.router, prefix="/api")
 app.include_router(batch_offer_requests.router, prefix="/api")
-app.include_router(airline_credits.router, prefix="/api") 
\ No newline at end of file
+app.include_router(airline_credits.router, prefix="/api")
+app.include_router(bookings.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(webhooks.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api") 
\ No newline at end of file
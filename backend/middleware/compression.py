@@ -0,0 +1,171 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class CompressionStats:
+    def __init__(self):
+        self.responses = {"br": 0, "gzip": 0}
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def stats(self) -> dict:
+        return {
+            "responses": dict(self.responses),
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+        }
+
+compression_stats = CompressionStats()
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_FINISH)
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._c.process(data) + self._c.finish()
+
+def _accepted(accept_encoding: str) -> set:
+    """
+    The content codings an Accept-Encoding header allows; "q=0" marks a
+    coding as not acceptable.
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli (when installed) or gzip, whichever the
+    client accepts. Complete bodies below `minimum_size` are left alone;
+    streamed bodies are compressed chunk by chunk and flushed as they go.
+    """
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, accept_encoding: str):
+        accepted = _accepted(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressingResponder(self, encoding, send).run(scope, receive)
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.app = middleware.app
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def run(self, scope, receive):
+        await self.app(scope, receive, self.send_with_compression)
+
+    def _new_encoder(self):
+        if self.encoding == "br":
+            return _BrotliEncoder(self.middleware.brotli_quality)
+        return _GzipEncoder(self.middleware.gzip_level)
+
+    def _set_headers(self, length: int = None):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+
+    async def send_with_compression(self, message):
+        stats = compression_stats
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # Already encoded, or event streams that must not be buffered
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            )
+            self.start_message = message
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body:
+                # Whole body in one message
+                if len(body) < self.middleware.minimum_size:
+                    stats.skipped += 1
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                compressed = self._new_encoder().finish(body)
+                self._set_headers(len(compressed))
+                stats.responses[self.encoding] += 1
+                stats.bytes_in += len(body)
+                stats.bytes_out += len(compressed)
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            # Streaming body: compress and flush every chunk
+            self.encoder = self._new_encoder()
+            self._set_headers()
+            stats.responses[self.encoding] += 1
+            await self.send(self.start_message)
+
+        compressed = self.encoder.chunk(body) if more_body else self.encoder.finish(body)
+        stats.bytes_in += len(body)
+        stats.bytes_out += len(compressed)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
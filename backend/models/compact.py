@@ -0,0 +1,219 @@
+import sys
+from weakref import WeakValueDictionary
+from backend.utils.dates import duration_minutes
+
+class Reference:
+    """
+    An airport, carrier or aircraft shared by every offer that mentions it.
+    """
+    __slots__ = ("kind", "id", "iata_code", "data", "__weakref__")
+
+    def __init__(self, kind: str, data: dict):
+        self.kind = kind
+        self.id = data.get("id")
+        self.iata_code = data.get("iata_code")
+        self.data = data
+
+class ReferenceInterner:
+    """
+    Deduplicates reference objects by (kind, id). Entries disappear once no
+    offer holds them any more.
+    """
+    def __init__(self):
+        self._refs = WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, kind: str, data):
+        if not isinstance(data, dict):
+            return data
+        key = (kind, data.get("id") or data.get("iata_code"))
+        ref = self._refs.get(key)
+        if ref is not None and ref.data == data:
+            self.hits += 1
+            return ref
+        self.misses += 1
+        ref = Reference(kind, data)
+        self._refs[key] = ref
+        return ref
+
+    def stats(self) -> dict:
+        return {"references": len(self._refs), "hits": self.hits, "misses": self.misses}
+
+interner = ReferenceInterner()
+
+def _data(value):
+    return value.data if isinstance(value, Reference) else value
+
+def _intern_str(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _absent(keys, data: dict) -> tuple:
+    # Modeled keys the payload did not have, so to_dict() does not invent them
+    return tuple(key for key in keys if key not in data)
+
+def _children(data: dict, key: str, skip: set) -> list:
+    # A null or non-list value is left in `extra` so it round-trips as is
+    value = data.get(key)
+    if isinstance(value, list):
+        return value
+    if key in data:
+        skip.discard(key)
+    return []
+
+def _without(data: dict, keys: tuple) -> dict:
+    for key in keys:
+        del data[key]
+    return data
+
+def parse_amount(value):
+    """
+    "123.45" -> (12345, 2); keeps the exact decimal places so the string
+    can be rebuilt verbatim.
+    """
+    if not isinstance(value, str):
+        return None, 0
+    whole, _, fraction = value.partition(".")
+    try:
+        return int(whole + fraction), len(fraction)
+    except ValueError:
+        return None, 0
+
+def format_amount(minor, scale: int):
+    if minor is None:
+        return None
+    sign = "-" if minor < 0 else ""
+    digits = str(abs(minor)).rjust(scale + 1, "0")
+    if not scale:
+        return sign + digits
+    return f"{sign}{digits[:-scale]}.{digits[-scale:]}"
+
+class CompactSegment:
+    __slots__ = (
+        "origin", "destination", "marketing_carrier", "operating_carrier", "aircraft",
+        "departing_at", "arriving_at", "duration", "duration_minutes", "extra", "absent",
+    )
+
+    REFERENCES = {
+        "origin": "airport",
+        "destination": "airport",
+        "marketing_carrier": "airline",
+        "operating_carrier": "airline",
+        "aircraft": "aircraft",
+    }
+
+    def __init__(self, data: dict):
+        for key, kind in self.REFERENCES.items():
+            setattr(self, key, interner.intern(kind, data.get(key)))
+        self.departing_at = data.get("departing_at")
+        self.arriving_at = data.get("arriving_at")
+        self.duration = _intern_str(data.get("duration"))
+        self.duration_minutes = duration_minutes(self.duration)
+        skip = self.REFERENCES.keys() | {"departing_at", "arriving_at", "duration"}
+        self.extra = {k: v for k, v in data.items() if k not in skip}
+        self.absent = _absent(skip, data)
+
+    def to_dict(self) -> dict:
+        return _without({
+            **{key: _data(getattr(self, key)) for key in self.REFERENCES},
+            "departing_at": self.departing_at,
+            "arriving_at": self.arriving_at,
+            "duration": self.duration,
+            **self.extra,
+        }, self.absent)
+
+class CompactSlice:
+    __slots__ = ("origin", "destination", "duration", "duration_minutes", "fare_brand_name", "segments", "extra", "absent")
+
+    def __init__(self, data: dict):
+        self.origin = interner.intern("airport", data.get("origin"))
+        self.destination = interner.intern("airport", data.get("destination"))
+        self.duration = _intern_str(data.get("duration"))
+        self.duration_minutes = duration_minutes(self.duration)
+        self.fare_brand_name = _intern_str(data.get("fare_brand_name"))
+        skip = {"origin", "destination", "duration", "fare_brand_name", "segments"}
+        self.segments = tuple(CompactSegment(s) for s in _children(data, "segments", skip))
+        self.extra = {k: v for k, v in data.items() if k not in skip}
+        self.absent = _absent(skip, data)
+
+    def to_dict(self) -> dict:
+        return _without({
+            "origin": _data(self.origin),
+            "destination": _data(self.destination),
+            "duration": self.duration,
+            "fare_brand_name": self.fare_brand_name,
+            "segments": [segment.to_dict() for segment in self.segments],
+            **self.extra,
+        }, self.absent)
+
+class CompactOffer:
+    """
+    Memory-lean offer: reference objects are interned across offers, amounts
+    are integers in minor units, durations are minutes. Keys the model does
+    not know about are kept verbatim, so to_dict() rebuilds the full payload.
+    """
+    __slots__ = (
+        "id", "owner", "currency", "scale", "total_minor", "base_minor", "tax_minor",
+        "expires_at", "slices", "extra", "absent",
+    )
+
+    AMOUNTS = {"total_amount": "total_minor", "base_amount": "base_minor", "tax_amount": "tax_minor"}
+
+    def __init__(self, data: dict):
+        self.id = data.get("id")
+        self.owner = interner.intern("airline", data.get("owner"))
+        self.currency = _intern_str(data.get("total_currency"))
+        self.scale = 0
+        for key, slot in self.AMOUNTS.items():
+            minor, scale = parse_amount(data.get(key))
+            setattr(self, slot, minor)
+            if key == "total_amount":
+                self.scale = scale
+        self.expires_at = data.get("expires_at")
+        skip = {"id", "owner", "total_currency", "expires_at", "slices"}
+        self.slices = tuple(CompactSlice(s) for s in _children(data, "slices", skip))
+        self.extra = {k: v for k, v in data.items() if k not in skip}
+        self.absent = _absent(skip, data)
+        # Only drop an amount string when it can be rebuilt exactly; nulls stay in extra
+        for key, slot in self.AMOUNTS.items():
+            value = self.extra.get(key)
+            if isinstance(value, str) and format_amount(getattr(self, slot), self.scale) == value:
+                del self.extra[key]
+            elif key in self.extra:
+                setattr(self, slot, None)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompactOffer":
+        return cls(data)
+
+    @property
+    def total(self) -> float:
+        if self.total_minor is None:
+            return float("inf")
+        return self.total_minor / (10 ** self.scale)
+
+    @property
+    def total_amount(self):
+        return format_amount(self.total_minor, self.scale)
+
+    @property
+    def total_duration(self):
+        minutes = [s.duration_minutes for s in self.slices]
+        if not minutes or None in minutes:
+            return None
+        return sum(minutes)
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "owner": _data(self.owner),
+            "total_currency": self.currency,
+            "expires_at": self.expires_at,
+            "slices": [s.to_dict() for s in self.slices],
+        }
+        for key, slot in self.AMOUNTS.items():
+            minor = getattr(self, slot)
+            if minor is not None:
+                data[key] = format_amount(minor, self.scale)
+        data.update(self.extra)
+        return _without(data, self.absent)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 
 class AirlineCredit(BaseModel):
     airline_iata_code: str
@@ -18,6 +18,15 @@ class OfferCreateRequest(BaseModel):
     supplier_timeout: Optional[int]
     max_connections: Optional[int]
 
+class OfferFanOutRequest(BaseModel):
+    search: OfferCreateRequest
+    # Searches every departure date within ±date_flex_days of the original
+    date_flex_days: int = Field(0, ge=0, le=7)
+    cabin_classes: Optional[List[str]] = None
+    # Alternative airports for the outbound origin / destination
+    origins: Optional[List[str]] = None
+    destinations: Optional[List[str]] = None
+
 class CreateOrderBody(BaseModel):
     type: str = Field(..., pattern="^(instant|hold)$")
     selected_offers: List[str]
@@ -28,4 +37,29 @@ class CreateOrderBody(BaseModel):
 class CreatePaymentRequest(BaseModel):
     order_id: str
     payment: Dict 
+
+class BookingRequest(BaseModel):
+    order: CreateOrderBody
+    # Pays a hold order right after creating it; instant orders use order.payments
+    payment: Optional[Dict] = None
+    wait_for_documents: bool = True
+    # Seconds to wait for documents before returning the order as it is
+    timeout: float = Field(20, gt=0, le=120)
+
+class BatchSubRequest(BaseModel):
+    id: str
+    method: str = Field("GET", pattern="^(GET|POST|PUT|PATCH|DELETE)$")
+    # Gateway path, e.g. /api/offers/off_123
+    path: str = Field(..., pattern="^/api/")
+    params: Optional[Dict] = None
+    body: Optional[Any] = None
+    # Ids of sub-requests that must finish first
+    depends_on: List[str] = []
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+class BulkGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
 # Add more as needed, following your Duffel business logic and API contract 
\ No newline at end of file
@@ -0,0 +1,146 @@
+import sys
+from array import array
+
+class CabinGrid:
+    """
+    One cabin of a seat map flattened into parallel arrays, one slot per seat:
+    designator, a bitmask of the passengers that may pick the seat and an
+    index into the seat map's shared price table. A passenger whose price
+    for a seat differs from that slot's price has it in `price_overrides`.
+    """
+    __slots__ = (
+        "segment_id", "slice_id", "cabin_class", "deck",
+        "designators", "availability", "price_index", "price_overrides", "service_ids",
+    )
+
+    def __init__(self, segment_id, slice_id, cabin_class, deck):
+        self.segment_id = segment_id
+        self.slice_id = slice_id
+        self.cabin_class = cabin_class
+        self.deck = deck
+        self.designators = []
+        self.availability = array("Q")
+        self.price_index = array("l")
+        # (seat slot, passenger bit) -> price index, where not price_index[slot]
+        self.price_overrides = {}
+        # (seat slot, passenger bit) -> available service id, for booking
+        self.service_ids = {}
+
+    def __len__(self):
+        return len(self.designators)
+
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self.designators)
+            + sum(sys.getsizeof(d) for d in self.designators)
+            + self.availability.itemsize * len(self.availability)
+            + self.price_index.itemsize * len(self.price_index)
+            + sys.getsizeof(self.price_overrides)
+            + sys.getsizeof(self.service_ids)
+            + sum(sys.getsizeof(s) for s in self.service_ids.values())
+        )
+
+class SeatGrid:
+    """
+    Compact decoding of Duffel's cabins -> rows -> sections -> elements
+    seat map payload, built to answer "which seats can this passenger take".
+    """
+    __slots__ = ("passengers", "prices", "cabins")
+
+    def __init__(self):
+        self.passengers = {}
+        # Shared (amount, currency) table; seats refer to it by index
+        self.prices = []
+        self.cabins = []
+
+    @classmethod
+    def from_seat_maps(cls, seat_maps: list) -> "SeatGrid":
+        grid = cls()
+        price_ids = {}
+        for seat_map in seat_maps or []:
+            for cabin in seat_map.get("cabins") or []:
+                cabin_grid = CabinGrid(
+                    seat_map.get("segment_id"), seat_map.get("slice_id"),
+                    cabin.get("cabin_class"), cabin.get("deck"),
+                )
+                for row in cabin.get("rows") or []:
+                    for section in row.get("sections") or []:
+                        for element in section.get("elements") or []:
+                            if element.get("type") == "seat":
+                                grid._add_seat(cabin_grid, element, price_ids)
+                grid.cabins.append(cabin_grid)
+        return grid
+
+    def _passenger_bit(self, passenger_id: str) -> int:
+        bit = self.passengers.get(passenger_id)
+        if bit is None:
+            bit = self.passengers[passenger_id] = len(self.passengers)
+            if bit >= 64:
+                raise ValueError("Seat grids support at most 64 passengers")
+        return bit
+
+    def _add_seat(self, cabin: CabinGrid, element: dict, price_ids: dict):
+        slot = len(cabin.designators)
+        mask = 0
+        price = -1
+        for service in element.get("available_services") or []:
+            bit = self._passenger_bit(service.get("passenger_id"))
+            mask |= 1 << bit
+            cabin.service_ids[(slot, bit)] = service.get("id")
+            key = (service.get("total_amount"), service.get("total_currency"))
+            if key not in price_ids:
+                price_ids[key] = len(self.prices)
+                self.prices.append(key)
+            # The first passenger's price is the slot's; the rest only if different
+            if price < 0:
+                price = price_ids[key]
+            elif price_ids[key] != price:
+                cabin.price_overrides[(slot, bit)] = price_ids[key]
+        cabin.designators.append(sys.intern(element.get("designator") or ""))
+        cabin.availability.append(mask)
+        cabin.price_index.append(price)
+
+    def nbytes(self) -> int:
+        return sum(cabin.nbytes() for cabin in self.cabins) + sys.getsizeof(self.prices)
+
+    def available(self, passenger_id: str, max_price: float = None, segment_id: str = None) -> list:
+        """
+        Seats `passenger_id` can select, optionally capped by price.
+        """
+        bit = self.passengers.get(passenger_id)
+        if bit is None:
+            return []
+        flag = 1 << bit
+        affordable = None
+        if max_price is not None:
+            affordable = {i for i, (amount, _) in enumerate(self.prices) if float(amount or 0) <= max_price}
+
+        results = []
+        for cabin in self.cabins:
+            if segment_id and cabin.segment_id != segment_id:
+                continue
+            seats = []
+            availability = cabin.availability
+            price_index = cabin.price_index
+            overrides = cabin.price_overrides
+            for slot in range(len(availability)):
+                if not availability[slot] & flag:
+                    continue
+                price = overrides.get((slot, bit), price_index[slot]) if overrides else price_index[slot]
+                if affordable is not None and price not in affordable:
+                    continue
+                amount, currency = self.prices[price] if price >= 0 else (None, None)
+                seats.append({
+                    "designator": cabin.designators[slot],
+                    "total_amount": amount,
+                    "total_currency": currency,
+                    "service_id": cabin.service_ids.get((slot, bit)),
+                })
+            results.append({
+                "segment_id": cabin.segment_id,
+                "slice_id": cabin.slice_id,
+                "cabin_class": cabin.cabin_class,
+                "deck": cabin.deck,
+                "seats": seats,
+            })
+        return results
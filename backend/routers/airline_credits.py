@@ -1,24 +1,26 @@
-from fastapi import APIRouter, Query
-from backend.services.duffel_client import DuffelClient
+from fastapi import APIRouter, Query, Request
+from backend.services.duffel_client import duffel
 from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+from backend.utils.streaming import forward_raw, ndjson_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.post("/airline-credits")
-async def create_airline_credit(data: dict):
+async def create_airline_credit(request: Request):
     try:
-        result = await duffel.post("/air/airline_credits", data)
-        return {"success": True, "data": result}
+        return await forward_raw(request, "/air/airline_credits")
     except Exception as e:
         return api_exception(e)
 
 @router.get("/airline-credits")
-async def list_airline_credits(user_id: str = None, limit: int = 50):
+async def list_airline_credits(user_id: str = None, limit: int = 50, stream: str = None):
     try:
         params = {"user_id": user_id, "limit": limit}
+        if stream == "all":
+            return await ndjson_response(duffel.paginate("/air/airline_credits", {"user_id": user_id}))
         result = await duffel.get("/air/airline_credits", params)
-        return {"success": True, "data": result}
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
@@ -26,6 +28,6 @@ async def list_airline_credits(user_id: str = None, limit: int = 50):
 async def get_airline_credit(id: str):
     try:
         result = await duffel.get(f"/air/airline_credits/{id}")
-        return {"success": True, "data": result}
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request
+from backend.models.duffel import BatchRequest
+from backend.services.batch import run_batch
+from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+
+router = APIRouter()
+
+@router.post("/batch")
+async def batch(body: BatchRequest, request: Request):
+    """
+    Runs several /api/* calls in one round trip. Sub-requests go through
+    the full router stack in-process and run concurrently unless ordered
+    by `depends_on`; the results come back as one array in input order.
+    """
+    try:
+        results = await run_batch(request.app, body, request.headers)
+        return api_response(results)
+    except Exception as e:
+        return api_exception(e)
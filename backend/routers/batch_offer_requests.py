@@ -1,15 +1,17 @@
-from fastapi import APIRouter
-from backend.services.duffel_client import DuffelClient
-from backend.utils.error_handlers import api_exception
+import time
+from fastapi import APIRouter, Request
+from backend.config import settings
+from backend.services.duffel_client import duffel
+from backend.utils.error_handlers import api_exception, error_body
+from backend.utils.responses import api_response
+from backend.utils.streaming import forward_raw, sse_event, sse_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.post("/batch-offer-requests")
-async def create_batch_offer_request(data: dict):
+async def create_batch_offer_request(request: Request):
     try:
-        result = await duffel.post("/air/batch_offer_requests", data)
-        return {"success": True, "data": result}
+        return await forward_raw(request, "/air/batch_offer_requests")
     except Exception as e:
         return api_exception(e)
 
@@ -17,6 +19,36 @@ async def create_batch_offer_request(data: dict):
 async def get_batch_offer_request(id: str):
     try:
         result = await duffel.get(f"/air/batch_offer_requests/{id}")
-        return {"success": True, "data": result}
+        return api_response(result)
     except Exception as e:
-        return api_exception(e)
\ No newline at end of file
+        return api_exception(e)
+
+async def _batch_events(id: str, first: dict):
+    # Each upstream GET long-polls until the next batch is ready
+    deadline = time.monotonic() + settings.batch_stream_max_seconds
+    result = first
+    try:
+        while True:
+            data = result.get("data") or {}
+            yield sse_event("batch", data)
+            if not data.get("remaining_batches"):
+                yield sse_event("done", {"id": id, "total_batches": data.get("total_batches")})
+                return
+            if time.monotonic() > deadline:
+                yield sse_event("timeout", {"id": id, "remaining_batches": data.get("remaining_batches")})
+                return
+            result = await duffel.get(f"/air/batch_offer_requests/{id}", coalesce=False)
+    except Exception as e:
+        yield sse_event("error", error_body(e))
+
+@router.get("/batch-offer-requests/{id}/stream")
+async def stream_batch_offer_request(id: str):
+    """
+    Pushes every batch of offers as a server-sent `batch` event as soon as
+    Duffel produces it, then a `done` event once no batches remain.
+    """
+    try:
+        first = await duffel.get(f"/air/batch_offer_requests/{id}", coalesce=False)
+        return sse_response(_batch_events(id, first))
+    except Exception as e:
+        return api_exception(e)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from backend.models.duffel import BookingRequest
+from backend.services.bookings import run_booking
+from backend.utils.error_handlers import api_exception, error_body
+from backend.utils.responses import api_response
+from backend.utils.streaming import sse_event, sse_response
+
+router = APIRouter()
+
+async def _booking_events(request: BookingRequest):
+    try:
+        async for event, data in run_booking(request):
+            yield sse_event(event, data)
+    except Exception as e:
+        yield sse_event("error", error_body(e))
+
+@router.post("/bookings")
+async def create_booking(request: BookingRequest, stream: bool = True):
+    """
+    Order -> payment -> ticketing in one call. Each step is pushed as a
+    server-sent event (`order`, `payment`, `waiting`, `booking`); with
+    stream=false only the final `booking` result is returned.
+    """
+    try:
+        if stream:
+            return sse_response(_booking_events(request))
+        booking = None
+        async for event, data in run_booking(request):
+            booking = data
+        return api_response({"data": booking})
+    except Exception as e:
+        return api_exception(e)
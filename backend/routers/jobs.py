@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Query
+from backend.services.jobs import jobs
+from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+
+router = APIRouter()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish")):
+    """
+    Status of a background job, with its result once it has succeeded.
+    """
+    try:
+        job = await jobs.wait(job_id, wait)
+        return api_response({"data": job.to_dict()})
+    except Exception as e:
+        return api_exception(e)
@@ -1,31 +1,60 @@
 from fastapi import APIRouter, Query
-from backend.models.duffel import OfferCreateRequest
-from backend.services.duffel_client import DuffelClient
+from backend.models.duffel import OfferCreateRequest, OfferFanOutRequest
+from backend.services.duffel_client import duffel
+from backend.services.fan_out import run_fan_out
+from backend.services.jobs import jobs
+from backend.services.prefetch import prefetcher
+from backend.utils import json_codec
 from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+from backend.utils.streaming import passthrough_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.post("/offer-requests")
-async def create_offer_request(request: OfferCreateRequest):
+async def create_offer_request(
+    request: OfferCreateRequest,
+    run_async: bool = Query(False, alias="async", description="Return 202 with a job id instead of waiting for the search"),
+    replaces: str = Query(None, description="Offer request this search replaces; its pending prefetch is cancelled"),
+):
     try:
-        result = await duffel.post("/air/offer_requests", {"data": request.dict(exclude_unset=True)})
-        return {"success": True, "data": result}
+        payload = {"data": request.dict(exclude_unset=True)}
+        if replaces:
+            prefetcher.cancel(replaces)
+        if run_async:
+            job = jobs.submit("offer_request", lambda: duffel.post("/air/offer_requests", payload))
+            response = api_response({"data": job.to_dict()}, status=202)
+            response.headers["Location"] = f"/api/jobs/{job.id}"
+            return response
+        upstream = await duffel.stream("POST", "/air/offer_requests", content=json_codec.dumps(payload))
+        return passthrough_response(upstream)
+    except Exception as e:
+        return api_exception(e)
+
+@router.post("/offer-requests/fan-out")
+async def fan_out_offer_requests(request: OfferFanOutRequest):
+    """
+    Runs one search per date / cabin / airport alternative concurrently and
+    returns the merged offers, cheapest first, with per-search timing.
+    """
+    try:
+        result = await run_fan_out(request)
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/offer-requests")
 async def list_offer_requests(limit: int = Query(50, ge=1, le=100)):
     try:
-        result = await duffel.get("/air/offer_requests", {"limit": limit})
-        return {"success": True, "data": result}
+        upstream = await duffel.stream("GET", "/air/offer_requests", {"limit": limit})
+        return passthrough_response(upstream)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/offer-requests/{request_id}")
 async def get_offer_request(request_id: str):
     try:
-        result = await duffel.get(f"/air/offer_requests/{request_id}")
-        return {"success": True, "data": result}
+        upstream = await duffel.stream("GET", f"/air/offer_requests/{request_id}")
+        return passthrough_response(upstream)
     except Exception as e:
         return api_exception(e) 
\ No newline at end of file
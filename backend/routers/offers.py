@@ -1,23 +1,94 @@
 from fastapi import APIRouter, Depends, Query
-from backend.services.duffel_client import DuffelClient
+from backend.models.duffel import BulkGetRequest
+from backend.services.bulk import bulk_get, check_ids
+from backend.services.duffel_client import duffel
+from backend.services.offer_details import fetch_offer
+from backend.services.offer_index import InvalidOfferQuery, OfferQuery, is_index_cursor, offer_indexes, paginate
+from backend.services.prefetch import prefetcher
 from backend.utils.error_handlers import api_exception
+from backend.utils.itinerary import group_by_itinerary
+from backend.utils.projection import FIELDS_QUERY, project, project_stream
+from backend.utils.responses import api_response
+from backend.utils.streaming import ndjson_response, passthrough_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.get("/offers")
-async def list_offers(offer_request_id: str = Query(...), limit: int = 50, sort: str = None):
+async def list_offers(
+    offer_request_id: str = Query(...),
+    limit: int = Query(50, ge=1, le=200),
+    sort: str = None,
+    stream: str = None,
+    fields: str = FIELDS_QUERY,
+    after: str = None,
+    min_price: float = None,
+    max_price: float = None,
+    max_stops: int = None,
+    max_duration: int = Query(None, description="Total duration across slices, in minutes"),
+    airlines: str = Query(None, description="Comma-separated owner IATA codes"),
+    departure_after: str = Query(None, description="HH:MM, outbound departure local time"),
+    departure_before: str = Query(None, description="HH:MM, outbound departure local time"),
+    group_by: str = Query(None, pattern="^itinerary$", description="Collapse fare-brand variants of the same flights"),
+):
     try:
         params = {"offer_request_id": offer_request_id, "limit": limit, "sort": sort}
-        result = await duffel.get("/air/offers", params)
-        return {"success": True, "data": result}
+        if stream == "all":
+            records = duffel.paginate("/air/offers", {"offer_request_id": offer_request_id, "sort": sort})
+            return await ndjson_response(project_stream(records, fields))
+
+        query = OfferQuery(
+            min_price=min_price,
+            max_price=max_price,
+            max_stops=max_stops,
+            max_duration=max_duration,
+            airlines=airlines.split(",") if airlines else None,
+            departure_after=departure_after,
+            departure_before=departure_before,
+        )
+        if group_by == "itinerary":
+            index = await offer_indexes.load(offer_request_id)
+            itineraries, conditions = group_by_itinerary(index.select(query, sort))
+            page, meta = paginate(itineraries, limit, after)
+            meta["offers"] = sum(len(node["fares"]) for node in itineraries)
+            result = {"data": page, "conditions": conditions, "meta": meta}
+            top = [node["fares"][0]["offer_id"] for node in page]
+            return prefetcher.after_response(api_response(project(result, fields)), offer_request_id, top)
+
+        if after and not is_index_cursor(after):
+            # A Duffel cursor from an earlier passthrough page continues upstream
+            if sort or not query.is_empty():
+                raise InvalidOfferQuery("This cursor can only continue an unsorted, unfiltered listing")
+            params["after"] = after
+        # Filter / sort / page interactions are answered from the local index
+        elif sort or after or not query.is_empty() or offer_indexes.get(offer_request_id):
+            index = await offer_indexes.load(offer_request_id)
+            result = index.query(query, sort=sort, limit=limit, after=after)
+            top = [offer.get("id") for offer in result["data"]]
+            return prefetcher.after_response(api_response(project(result, fields)), offer_request_id, top)
+
+        if fields:
+            result = await duffel.get("/air/offers", params)
+            top = [offer.get("id") for offer in result.get("data") or [] if isinstance(offer, dict)]
+            return prefetcher.after_response(api_response(project(result, fields)), offer_request_id, top)
+        # Not prefetched: the streamed body is never parsed, and looking the
+        # top offers up again would spend search quota on every listing
+        upstream = await duffel.stream("GET", "/air/offers", params)
+        return passthrough_response(upstream)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/offers/{offer_id}")
-async def get_offer(offer_id: str):
+async def get_offer(offer_id: str, fields: str = FIELDS_QUERY):
+    try:
+        result = await fetch_offer(offer_id)
+        return api_response(project(result, fields))
+    except Exception as e:
+        return api_exception(e)
+
+@router.post("/offers/bulk-get")
+async def bulk_get_offers(request: BulkGetRequest, fields: str = FIELDS_QUERY):
     try:
-        result = await duffel.get(f"/air/offers/{offer_id}")
-        return {"success": True, "data": result}
+        ids = check_ids(request.ids)
+        return await ndjson_response(bulk_get("offers", ids, fields))
     except Exception as e:
-        return api_exception(e)
\ No newline at end of file
+        return api_exception(e)
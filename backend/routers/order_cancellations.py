@@ -1,24 +1,41 @@
 from fastapi import APIRouter
-from backend.services.duffel_client import DuffelClient
+from backend.services.duffel_client import duffel
+from backend.services.offer_details import invalidate_order
+from backend.services.read_model import CONSISTENCY_QUERY, read_model
 from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+from backend.utils.streaming import ndjson_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.post("/order-cancellations")
 async def create_order_cancellation(order_id: str):
     try:
         result = await duffel.post("/air/order_cancellations", {"order_id": order_id})
-        return {"success": True, "data": result}
+        invalidate_order(order_id)
+        await read_model.record("order_cancellations", result.get("data"))
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/order-cancellations")
-async def list_order_cancellations(order_id: str = None, limit: int = 50):
+async def list_order_cancellations(
+    order_id: str = None,
+    limit: int = 50,
+    stream: str = None,
+    consistency: str = CONSISTENCY_QUERY,
+):
     try:
         params = {"order_id": order_id, "limit": limit}
+        if stream == "all":
+            return await ndjson_response(duffel.paginate("/air/order_cancellations", {"order_id": order_id}))
+        if consistency != "strong":
+            cancellations = await read_model.list("order_cancellations", limit, order_id=order_id)
+            if cancellations is not None:
+                return api_response({"data": cancellations, "meta": read_model.meta("order_cancellations", limit)})
         result = await duffel.get("/air/order_cancellations", params)
-        return {"success": True, "data": result}
+        await read_model.record("order_cancellations", result.get("data"))
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
@@ -26,6 +43,6 @@ async def list_order_cancellations(order_id: str = None, limit: int = 50):
 async def get_order_cancellation(cancellation_id: str):
     try:
         result = await duffel.get(f"/air/order_cancellations/{cancellation_id}")
-        return {"success": True, "data": result}
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
\ No newline at end of file
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, Query
-from backend.models.duffel import CreateOrderBody
-from backend.services.duffel_client import DuffelClient
+from backend.models.duffel import BulkGetRequest, CreateOrderBody
+from backend.services.bulk import bulk_get, check_ids
+from backend.services.duffel_client import duffel
+from backend.services.offer_details import invalidate_order
+from backend.services.order_waiter import CONDITIONS, order_waiter
+from backend.services.read_model import CONSISTENCY_QUERY, read_model
 from backend.utils.error_handlers import api_exception
+from backend.utils.projection import FIELDS_QUERY, project, project_stream
+from backend.utils.responses import api_response
+from backend.utils.streaming import ndjson_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 # backend/routers/orders.py
 
@@ -13,23 +19,69 @@ async def create_order(request: CreateOrderBody):
     try:
         payload = {"data": request.dict(exclude_none=True)}
         result = await duffel.post("/air/orders", payload)
-        return {"success": True, "data": result}
+        invalidate_order(result.get("data", {}).get("id"), request.selected_offers)
+        await read_model.record("orders", result.get("data"))
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/orders")
-async def list_orders(limit: int = 50, sort: str = "created_at"):
+async def list_orders(
+    limit: int = 50,
+    sort: str = "created_at",
+    stream: str = None,
+    fields: str = FIELDS_QUERY,
+    consistency: str = CONSISTENCY_QUERY,
+):
     try:
         params = {"limit": limit, "sort": sort}
+        if stream == "all":
+            records = duffel.paginate("/air/orders", {"sort": sort})
+            return await ndjson_response(project_stream(records, fields))
+        if consistency != "strong":
+            orders = await read_model.list("orders", limit, sort=sort)
+            if orders is not None:
+                return api_response(project({"data": orders, "meta": read_model.meta("orders", limit)}, fields))
         result = await duffel.get("/air/orders", params)
-        return {"success": True, "data": result}
+        await read_model.record("orders", result.get("data"))
+        return api_response(project(result, fields))
     except Exception as e:
         return api_exception(e)
 
 @router.get("/orders/{order_id}")
-async def get_order(order_id: str):
+async def get_order(
+    order_id: str,
+    fields: str = FIELDS_QUERY,
+    consistency: str = CONSISTENCY_QUERY,
+):
     try:
-        result = await duffel.get(f"/air/orders/{order_id}")
-        return {"success": True, "data": result}
+        result = await read_model.fetch("orders", order_id, strong=consistency == "strong")
+        return api_response(project(result, fields))
     except Exception as e:
-        return api_exception(e)
\ No newline at end of file
+        return api_exception(e)
+
+@router.get("/orders/{order_id}/wait")
+async def wait_for_order(
+    order_id: str,
+    until: str = Query(..., pattern=f"^({'|'.join(CONDITIONS)})$"),
+    timeout: float = Query(30, gt=0, le=120),
+    fields: str = FIELDS_QUERY,
+):
+    """
+    Long-polls until the order is `until`, or `timeout` seconds pass.
+    Callers waiting on the same order share one upstream poll loop.
+    """
+    try:
+        order, satisfied = await order_waiter.wait(order_id, until, timeout)
+        result = {"data": order, "meta": {"until": until, "satisfied": satisfied}}
+        return api_response(project(result, fields))
+    except Exception as e:
+        return api_exception(e)
+
+@router.post("/orders/bulk-get")
+async def bulk_get_orders(request: BulkGetRequest, fields: str = FIELDS_QUERY):
+    try:
+        ids = check_ids(request.ids)
+        return await ndjson_response(bulk_get("orders", ids, fields))
+    except Exception as e:
+        return api_exception(e)
@@ -1,32 +1,31 @@
-from fastapi import APIRouter
-from backend.services.duffel_client import DuffelClient
+from typing import List
+from fastapi import APIRouter, Query, Request
+from backend.services.partial_offers import partial_offer_tree
 from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+from backend.utils.streaming import forward_raw
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.post("/partial-offer-requests")
-async def create_partial_offer_request(data: dict):
+async def create_partial_offer_request(request: Request):
     try:
-        result = await duffel.post("/air/partial_offer_requests", data)
-        return {"success": True, "data": result}
+        return await forward_raw(request, "/air/partial_offer_requests")
     except Exception as e:
         return api_exception(e)
 
 @router.get("/partial-offer-requests/{id}")
-async def get_partial_offer_request(id: str, selected_partial_offer: list = None):
+async def get_partial_offer_request(id: str, selected_partial_offer: List[str] = Query(None)):
     try:
-        params = {'selected_partial_offer[]': selected_partial_offer}
-        result = await duffel.get(f"/air/partial_offer_requests/{id}", params)
-        return {"success": True, "data": result}
+        result = await partial_offer_tree.get(id, selected_partial_offer, "offers")
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
 @router.get("/partial-offer-requests/{id}/fares")
-async def get_full_offer_fares(id: str, selected_partial_offer: list = None):
+async def get_full_offer_fares(id: str, selected_partial_offer: List[str] = Query(None)):
     try:
-        params = {'selected_partial_offer[]': selected_partial_offer}
-        result = await duffel.get(f"/air/partial_offer_requests/{id}/fares", params)
-        return {"success": True, "data": result}
+        result = await partial_offer_tree.get(id, selected_partial_offer, "fares")
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
\ No newline at end of file
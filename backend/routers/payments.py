@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Query
-from backend.services.duffel_client import DuffelClient
+from fastapi import APIRouter
+from backend.services.bulk import bulk_get, check_ids
+from backend.services.duffel_client import duffel
+from backend.services.offer_details import invalidate_order
+from backend.services.order_waiter import order_waiter
+from backend.services.read_model import CONSISTENCY_QUERY, read_model
 from backend.utils.error_handlers import api_exception
-from backend.models.duffel import CreatePaymentRequest 
+from backend.utils.projection import FIELDS_QUERY
+from backend.utils.responses import api_response
+from backend.utils.streaming import ndjson_response
+from backend.models.duffel import BulkGetRequest, CreatePaymentRequest 
 
 router = APIRouter()
-duffel = DuffelClient()
 
 
 
@@ -15,18 +21,34 @@ async def create_payment(request: CreatePaymentRequest): # <--- Use the model he
         payload = {"data": request.dict()}
         
         result = await duffel.post("/air/payments", payload)
-        return {"success": True, "data": result}
+        invalidate_order(request.order_id)
+        await read_model.record("payments", result.get("data"))
+        # Anyone long-polling this order should see the payment now
+        order_waiter.notify(request.order_id)
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
 # ... keep list_payments and get_payment as they are ...
 
 @router.get("/payments")
-async def list_payments(order_id: str = None, limit: int = 50):
+async def list_payments(
+    order_id: str = None,
+    limit: int = 50,
+    stream: str = None,
+    consistency: str = CONSISTENCY_QUERY,
+):
     try:
         params = {"order_id": order_id, "limit": limit}
+        if stream == "all":
+            return await ndjson_response(duffel.paginate("/air/payments", {"order_id": order_id}))
+        if consistency != "strong":
+            payments = await read_model.list("payments", limit, order_id=order_id)
+            if payments is not None:
+                return api_response({"data": payments, "meta": read_model.meta("payments", limit)})
         result = await duffel.get("/air/payments", params)
-        return {"success": True, "data": result}
+        await read_model.record("payments", result.get("data"))
+        return api_response(result)
     except Exception as e:
         return api_exception(e)
 
@@ -34,6 +56,14 @@ async def list_payments(order_id: str = None, limit: int = 50):
 async def get_payment(payment_id: str):
     try:
         result = await duffel.get(f"/air/payments/{payment_id}")
-        return {"success": True, "data": result}
+        return api_response(result)
     except Exception as e:
-        return api_exception(e) 
\ No newline at end of file
+        return api_exception(e)
+
+@router.post("/payments/bulk-get")
+async def bulk_get_payments(request: BulkGetRequest, fields: str = FIELDS_QUERY):
+    try:
+        ids = check_ids(request.ids)
+        return await ndjson_response(bulk_get("payments", ids, fields))
+    except Exception as e:
+        return api_exception(e)
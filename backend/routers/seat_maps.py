@@ -1,14 +1,32 @@
 from fastapi import APIRouter, Query
-from backend.services.duffel_client import DuffelClient
+from backend.services.offer_details import fetch_seat_grid, fetch_seat_maps
 from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
 
 router = APIRouter()
-duffel = DuffelClient()
 
 @router.get("/seat-maps")
 async def get_seat_maps(offer_id: str = Query(...)):
     try:
-        result = await duffel.get("/air/seat_maps", {"offer_id": offer_id})
-        return {"success": True, "data": result}
+        result = await fetch_seat_maps(offer_id)
+        return api_response(result)
     except Exception as e:
-        return api_exception(e) 
\ No newline at end of file
+        return api_exception(e)
+
+@router.get("/seat-maps/available")
+async def get_available_seats(
+    offer_id: str = Query(...),
+    passenger_id: str = Query(...),
+    max_price: float = None,
+    segment_id: str = None,
+):
+    """
+    Seats the passenger can select, answered from the compact seat grid
+    instead of the nested seat map payload.
+    """
+    try:
+        grid = await fetch_seat_grid(offer_id)
+        cabins = grid.available(passenger_id, max_price=max_price, segment_id=segment_id)
+        return api_response({"data": cabins})
+    except Exception as e:
+        return api_exception(e)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request
+from backend.services.webhooks import InvalidWebhookSignature, parse_event, verify_signature, webhook_pipeline
+from backend.utils.error_handlers import api_exception
+from backend.utils.responses import api_response
+
+router = APIRouter()
+
+@router.post("/webhooks/duffel")
+async def receive_duffel_webhook(request: Request):
+    """
+    Verifies the signature, queues the event and acknowledges at once;
+    the event is applied by the background pipeline.
+    """
+    try:
+        body = await request.body()
+        try:
+            verify_signature(body, request.headers.get("x-duffel-signature"))
+        except InvalidWebhookSignature:
+            webhook_pipeline.rejected += 1
+            raise
+        event = parse_event(body)
+        queued = webhook_pipeline.submit(event)
+        return api_response({"id": event.get("id"), "status": "queued" if queued else "duplicate"}, status=202)
+    except Exception as e:
+        return api_exception(e)
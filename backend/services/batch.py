@@ -0,0 +1,99 @@
+import asyncio
+import time
+import httpx
+from backend.config import settings
+from backend.models.duffel import BatchRequest, BatchSubRequest
+from backend.utils import json_codec
+
+# Caller headers worth carrying into every sub-request
+FORWARDED_HEADERS = ("x-api-key",)
+
+class InvalidBatch(ValueError):
+    type = "validation_error"
+    status_code = 422
+
+def _check(body: BatchRequest):
+    requests = body.requests
+    if len(requests) > settings.batch_max_requests:
+        raise InvalidBatch(f"Batch has {len(requests)} requests, the limit is {settings.batch_max_requests}")
+    ids = [r.id for r in requests]
+    if len(set(ids)) != len(ids):
+        raise InvalidBatch("Sub-request ids must be unique")
+    for r in requests:
+        if r.path.split("?", 1)[0].rstrip("/") == "/api/batch":
+            raise InvalidBatch(f"Sub-request '{r.id}' cannot call /api/batch")
+        unknown = set(r.depends_on) - set(ids)
+        if unknown:
+            raise InvalidBatch(f"Sub-request '{r.id}' depends on unknown ids {sorted(unknown)}")
+
+    # Depth-first walk to reject dependency cycles before anything runs
+    graph = {r.id: r.depends_on for r in requests}
+    done, visiting = set(), set()
+
+    def visit(node):
+        if node in done:
+            return
+        if node in visiting:
+            raise InvalidBatch(f"Dependency cycle through '{node}'")
+        visiting.add(node)
+        for dependency in graph[node]:
+            visit(dependency)
+        visiting.discard(node)
+        done.add(node)
+
+    for node in graph:
+        visit(node)
+
+def _decode(response: httpx.Response):
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            return json_codec.loads(response.content)
+        except ValueError:
+            pass
+    return response.text
+
+async def run_batch(app, body: BatchRequest, headers=None) -> list:
+    """
+    Runs every sub-request through `app` in-process, concurrently except
+    where `depends_on` orders them. Results keep the input order; a
+    sub-request whose dependency failed is not run and reports 424.
+    """
+    _check(body)
+    forwarded = {k: v for k, v in (headers or {}).items() if k.lower() in FORWARDED_HEADERS}
+    # Compressing bodies that never leave the process is wasted work
+    forwarded["accept-encoding"] = "identity"
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+    tasks = {}
+
+    async def run(client: httpx.AsyncClient, sub: BatchSubRequest) -> dict:
+        results = await asyncio.gather(*(tasks[d] for d in sub.depends_on))
+        failed = [r["id"] for r in results if r["status"] >= 400]
+        if failed:
+            return {
+                "id": sub.id,
+                "status": 424,
+                "body": {"success": False, "error": {
+                    "message": f"Skipped, dependencies failed: {failed}",
+                    "type": "dependency_error",
+                    "details": None,
+                }},
+                "duration_ms": 0.0,
+            }
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(
+                sub.method, sub.path, params=sub.params,
+                json=sub.body if sub.body is not None else None, headers=forwarded,
+            )
+            return {
+                "id": sub.id,
+                "status": response.status_code,
+                "body": _decode(response),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+        for sub in body.requests:
+            tasks[sub.id] = asyncio.ensure_future(run(client, sub))
+        return await asyncio.gather(*(tasks[sub.id] for sub in body.requests))
@@ -0,0 +1,61 @@
+from backend.models.duffel import BookingRequest
+from backend.services.duffel_client import duffel
+from backend.services.offer_details import invalidate_order
+from backend.services.order_waiter import CONDITIONS, order_waiter
+from backend.services.read_model import read_model
+
+class BookingFailed(Exception):
+    """
+    A booking step failed. `details` names the step and, once the order
+    exists, its id so the client can pick it up from there.
+    """
+    type = "booking_error"
+
+    def __init__(self, step: str, cause: Exception, order: dict = None):
+        super().__init__(f"Booking failed while {step}: {cause}")
+        self.details = {
+            "step": step,
+            "order_id": (order or {}).get("id"),
+            "upstream": getattr(cause, "details", None),
+        }
+        for attr in ("status_code", "retry_after"):
+            if getattr(cause, attr, None) is not None:
+                setattr(self, attr, getattr(cause, attr))
+
+async def run_booking(body: BookingRequest):
+    """
+    Creates the order, pays it when a payment is given for a hold order
+    and waits for its documents, yielding an (event, data) pair per step.
+    The last event is `booking` with the final order.
+    """
+    step = "creating the order"
+    order = None
+    payment = None
+    try:
+        result = await duffel.post("/air/orders", {"data": body.order.dict(exclude_none=True)})
+        order = result.get("data") or {}
+        invalidate_order(order.get("id"), body.order.selected_offers)
+        await read_model.record("orders", order)
+        yield "order", order
+
+        if body.payment is not None and body.order.type == "hold":
+            step = "paying the order"
+            result = await duffel.post("/air/payments", {"data": {"order_id": order.get("id"), "payment": body.payment}})
+            payment = result.get("data")
+            invalidate_order(order.get("id"))
+            await read_model.record("payments", payment)
+            yield "payment", payment
+    except Exception as e:
+        raise BookingFailed(step, e, order) from e
+
+    paid = body.order.type == "instant" or payment is not None
+    issued = CONDITIONS["documents_issued"](order)
+    if paid and body.wait_for_documents and not issued:
+        yield "waiting", {"order_id": order.get("id"), "timeout": body.timeout}
+        try:
+            order, issued = await order_waiter.wait(order.get("id"), "documents_issued", body.timeout)
+        except Exception:
+            # The order is booked either way; documents can be fetched later
+            pass
+    await read_model.record("orders", order)
+    yield "booking", {"order": order, "payment": payment, "documents_issued": issued}
@@ -0,0 +1,56 @@
+import asyncio
+from backend.config import settings
+from backend.services.offer_details import fetch_offer
+from backend.services.read_model import read_model
+from backend.utils.error_handlers import error_body
+from backend.utils.projection import project
+
+class BulkTooLarge(ValueError):
+    type = "validation_error"
+    status_code = 422
+
+# Lookups that already go through the response cache or the read model
+FETCHERS = {
+    "offers": fetch_offer,
+    "orders": lambda order_id: read_model.fetch("orders", order_id),
+    "payments": lambda payment_id: read_model.fetch("payments", payment_id),
+}
+
+def _error(e: Exception) -> dict:
+    response = getattr(e, "response", None)
+    return {**error_body(e), "status": getattr(e, "status_code", None) or getattr(response, "status_code", None)}
+
+def check_ids(ids: list) -> list:
+    """
+    Drops duplicate ids, keeping the first occurrence, and enforces the limit.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > settings.bulk_get_max_ids:
+        raise BulkTooLarge(f"{len(ids)} ids requested, the limit is {settings.bulk_get_max_ids}")
+    return ids
+
+async def bulk_get(resource: str, ids: list, fields: str = None):
+    """
+    Looks up every id (at most BULK_GET_MAX_IDS, see check_ids) with
+    bounded concurrency and yields one {"id", "data", "error"} record per
+    id in completion order; a failed lookup only fails its own record.
+    """
+    fetch = FETCHERS[resource]
+    semaphore = asyncio.Semaphore(settings.bulk_get_concurrency)
+
+    async def get(record_id):
+        async with semaphore:
+            try:
+                result = await fetch(record_id)
+                return {"id": record_id, "data": result.get("data"), "error": None}
+            except Exception as e:
+                return {"id": record_id, "data": None, "error": _error(e)}
+
+    tasks = [asyncio.ensure_future(get(record_id)) for record_id in ids]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield project(await next_done, fields)
+    finally:
+        # The client went away mid-stream
+        for task in tasks:
+            task.cancel()
@@ -1,5 +1,75 @@
+import asyncio
+import importlib.util
+import time
 import httpx
 from backend.config import settings
+from backend.services.latency import endpoint_key, latency
+from backend.services.rate_limit import (
+    RETRY_STATUSES, backoff_delay, endpoint_family, rate_limiter, retry_after
+)
+from backend.services.single_flight import SingleFlight
+from backend.utils import json_codec
+
+# httpx decodes br responses only when brotli is installed
+ACCEPT_ENCODING = "br, gzip" if importlib.util.find_spec("brotli") else "gzip"
+
+# One pooled client per process, opened and closed by the app lifespan.
+_http_client = None
+
+def _build_http_client():
+    limits = httpx.Limits(
+        max_connections=settings.duffel_max_connections,
+        max_keepalive_connections=settings.duffel_max_keepalive_connections,
+        keepalive_expiry=settings.duffel_keepalive_expiry,
+    )
+    try:
+        return httpx.AsyncClient(
+            base_url=settings.duffel_base_url,
+            timeout=settings.duffel_timeout,
+            limits=limits,
+            http2=settings.duffel_http2,
+        )
+    except ImportError:
+        # http2=True needs the optional `h2` package (httpx[http2])
+        return httpx.AsyncClient(
+            base_url=settings.duffel_base_url,
+            timeout=settings.duffel_timeout,
+            limits=limits,
+        )
+
+def get_http_client():
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+async def start_http_client():
+    """
+    Opens the shared pool and warms it up so the first proxied call
+    does not pay the TCP+TLS handshake.
+    """
+    client = get_http_client()
+    await warm_up(client, settings.duffel_warmup_connections)
+    return client
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+async def warm_up(client, connections: int):
+    if connections <= 0 or not settings.duffel_api_key:
+        return
+    headers = duffel.headers
+
+    async def ping():
+        try:
+            await client.get("/air/airlines", headers=headers, params={"limit": 1})
+        except httpx.HTTPError as e:
+            print(f"Duffel warm-up failed: {e}")
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
 
 class DuffelClient:
     def __init__(self):
@@ -9,44 +79,206 @@ class DuffelClient:
             "Authorization": f"Bearer {settings.duffel_api_key}",
             "Duffel-Version": settings.duffel_api_version,
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Content-Type": "application/json"
         }
+        self.single_flight = SingleFlight()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.hedge_eligible = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    async def _send(self, method, path, stream=False, **kwargs):
+        """
+        Sends one call through the family's token bucket. Idempotent GETs
+        are retried with jittered backoff on 429/5xx and transport errors,
+        and time out after a multiple of the endpoint's own p99 latency.
+        """
+        client = get_http_client()
+        bucket = rate_limiter.bucket(endpoint_family(path))
+        key = endpoint_key(method, path)
+        attempts = settings.duffel_max_retries + 1 if method == "GET" else 1
+        # Writes keep the fixed timeout; cutting one short could double-book
+        timeout = latency.timeout_for(key) if method == "GET" else settings.duffel_timeout
+
+        for attempt in range(attempts):
+            await bucket.acquire()
+            started = time.perf_counter()
+            try:
+                request = client.build_request(method, path, headers=self.headers, timeout=timeout, **kwargs)
+                r = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if isinstance(e, httpx.TimeoutException):
+                    # Counted at the timeout so a slowing endpoint widens its own budget
+                    latency.observe(key, timeout)
+                if attempt + 1 >= attempts:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if r.status_code < 500:
+                latency.observe(key, time.perf_counter() - started)
+            bucket.update_from_headers(r.headers)
+            if r.status_code == 429:
+                bucket.pause(retry_after(r.headers) or backoff_delay(attempt))
+            if r.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                return r
+            delay = backoff_delay(attempt, retry_after(r.headers))
+            if delay > settings.duffel_rate_limit_max_wait:
+                return r
+            if stream:
+                await r.aclose()
+            await asyncio.sleep(delay)
+
+    def _raise_for_error(self, r):
+        if not r.is_error:
+            return
+        try:
+            # Try to get the real error from Duffel
+            error_details = json_codec.loads(r.content)
+        except ValueError:
+            error_details = r.text
 
-    async def get(self, path, params=None):
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.get(f"{self.base_url}{path}", headers=self.headers, params=params)
+        try:
             r.raise_for_status()
-            return r.json()
+        except httpx.HTTPStatusError as e:
+            # Attach the details so api_exception handler can see them
+            e.details = error_details
+            if r.status_code == 429:
+                e.type = "rate_limit_error"
+                e.status_code = 429
+                e.retry_after = retry_after(r.headers)
+            raise e
+
+    async def _hedged_send(self, path, **kwargs):
+        """
+        GETs `path`, and if no response has come back by the endpoint's p95
+        latency, sends a second identical request; the first to succeed wins.
+        """
+        self.hedge_eligible += 1
+        key = endpoint_key("GET", path)
+        delay = latency.hedge_delay(key)
+        if delay is None:
+            return await self._send("GET", path, **kwargs)
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._send("GET", path, **kwargs))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            bucket = rate_limiter.bucket(endpoint_family(path))
+            # Only spend spare rate-limit budget on the backup request
+            if done or bucket.headroom() < settings.duffel_hedge_min_headroom:
+                return await primary
+
+            self.hedged += 1
+            backup = asyncio.ensure_future(self._send("GET", path, **kwargs))
+            pending.add(backup)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both failed; surface the original request's error
+            return primary.result()
+        finally:
+            if primary in pending:
+                # An abandoned primary never reports its latency; record how
+                # long it had taken so far so the tail stays in p95/p99
+                latency.observe(key, time.perf_counter() - started)
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, method, path, params=None, json=None, hedge=False):
+        if hedge and method == "GET" and settings.duffel_hedging:
+            r = await self._hedged_send(path, params=params)
+        else:
+            r = await self._send(method, path, params=params, json=json)
+        self._raise_for_error(r)
+        self.record_transfer(r, len(r.content))
+        return json_codec.loads(r.content)
+
+    async def get(self, path, params=None, coalesce=True, hedge=False):
+        """
+        `hedge=True` opts a latency-sensitive lookup into hedging when
+        DUFFEL_HEDGING is on.
+        """
+        if not coalesce:
+            return await self._request("GET", path, params=params, hedge=hedge)
+        # Identical concurrent GETs share one upstream call
+        key = (path, tuple(sorted(httpx.QueryParams(params).multi_items())))
+        return await self.single_flight.do(key, lambda: self._request("GET", path, params=params, hedge=hedge))
+
+    async def stream(self, method, path, params=None, content=None):
+        """
+        Returns the upstream response with its body still unread, so the
+        caller can forward the raw bytes without parsing them.
+        The caller must close the response.
+        """
+        r = await self._send(method, path, stream=True, params=params, content=content)
+        if r.is_error:
+            await r.aread()
+            await r.aclose()
+            self._raise_for_error(r)
+        return r
+
+    async def paginate(self, path, params=None, page_size=200):
+        """
+        Yields every record behind a list endpoint, following `meta.after`.
+        The next page is requested while the current one is being consumed,
+        so at most two pages are held in memory.
+        """
+        params = {**(params or {}), "limit": min(page_size, 200)}
+        next_page = asyncio.ensure_future(self.get(path, params, coalesce=False))
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                after = (page.get("meta") or {}).get("after")
+                if after:
+                    next_page = asyncio.ensure_future(self.get(path, {**params, "after": after}, coalesce=False))
+                for record in page.get("data") or []:
+                    yield record
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
     async def post(self, path, data=None):
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}{path}", headers=self.headers, json=data or {})
-            
-            # IMPROVED ERROR HANDLING
-            if r.is_error:
-                try:
-                    # Try to get the real error from Duffel
-                    error_details = r.json()
-                except:
-                    error_details = r.text
-                
-                try:
-                    r.raise_for_status()
-                except httpx.HTTPStatusError as e:
-                    # Attach the details so api_exception handler can see them
-                    e.details = error_details
-                    raise e
-            
-            return r.json()
+        return await self._request("POST", path, json=data or {})
 
     async def patch(self, path, data=None):
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.patch(f"{self.base_url}{path}", headers=self.headers, json=data or {})
-            r.raise_for_status()
-            return r.json()
+        return await self._request("PATCH", path, json=data or {})
 
     async def delete(self, path):
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.delete(f"{self.base_url}{path}", headers=self.headers)
-            r.raise_for_status()
-            return r.json()
\ No newline at end of file
+        return await self._request("DELETE", path)
+
+    def record_transfer(self, r, decoded_bytes: int):
+        # num_bytes_downloaded counts the body as it came off the wire
+        self.wire_bytes += r.num_bytes_downloaded
+        self.decoded_bytes += decoded_bytes
+
+    def stats(self) -> dict:
+        return {
+            "rate_limits": rate_limiter.stats(),
+            "single_flight": self.single_flight.stats(),
+            "latency": latency.stats(),
+            "hedging": {
+                "enabled": settings.duffel_hedging,
+                "eligible": self.hedge_eligible,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": round(self.hedged / self.hedge_eligible, 3) if self.hedge_eligible else 0.0,
+                "win_rate": round(self.hedge_wins / self.hedged, 3) if self.hedged else 0.0,
+            },
+            "transfer": {
+                "accept_encoding": ACCEPT_ENCODING,
+                "wire_bytes": self.wire_bytes,
+                "decoded_bytes": self.decoded_bytes,
+                "bytes_saved": self.decoded_bytes - self.wire_bytes,
+            },
+        }
+
+# Shared by every router so they all draw from the same pool.
+duffel = DuffelClient()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from datetime import date, timedelta
+from itertools import product
+from backend.config import settings
+from backend.models.duffel import OfferFanOutRequest
+from backend.services.duffel_client import duffel
+from backend.utils.error_handlers import error_body
+from backend.utils.itinerary import itinerary_key, offer_amount
+
+class FanOutTooLarge(ValueError):
+    type = "validation_error"
+    status_code = 422
+
+class FanOutInvalid(ValueError):
+    type = "validation_error"
+    status_code = 422
+
+def _shift(day: str, offset: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=offset)).isoformat()
+
+def _check_slices(slices) -> list:
+    """
+    The slices to shift, each with a valid YYYY-MM-DD departure_date.
+    """
+    if not slices:
+        raise FanOutInvalid("search.slices must contain at least one slice")
+    for i, s in enumerate(slices):
+        if not isinstance(s, dict) or not isinstance(s.get("departure_date"), str):
+            raise FanOutInvalid(f"search.slices[{i}].departure_date is required")
+        try:
+            date.fromisoformat(s["departure_date"])
+        except ValueError:
+            raise FanOutInvalid(f"search.slices[{i}].departure_date must be YYYY-MM-DD, got '{s['departure_date']}'")
+    return slices
+
+def build_searches(body: OfferFanOutRequest) -> list:
+    """
+    Expands a fan-out request into one offer request payload per
+    combination of date offset, cabin class and airport pair.
+    """
+    base = body.search.dict(exclude_unset=True)
+    slices = _check_slices(base.get("slices"))
+    first = slices[0]
+    last = slices[-1]
+    # A return trip mirrors the outbound airports on its last slice
+    is_return = len(slices) > 1 and last.get("origin") == first.get("destination") and last.get("destination") == first.get("origin")
+
+    offsets = range(-body.date_flex_days, body.date_flex_days + 1)
+    cabins = body.cabin_classes or [body.search.cabin_class]
+    origins = body.origins or [first.get("origin")]
+    destinations = body.destinations or [first.get("destination")]
+
+    searches = []
+    for offset, cabin, origin, destination in product(offsets, cabins, origins, destinations):
+        if origin == destination:
+            continue
+        new_slices = [{**s, "departure_date": _shift(s["departure_date"], offset)} for s in slices]
+        new_slices[0].update(origin=origin, destination=destination)
+        if is_return:
+            new_slices[-1].update(origin=destination, destination=origin)
+        searches.append({
+            "variant": {"departure_offset": offset, "cabin_class": cabin, "origin": origin, "destination": destination},
+            "payload": {"data": {**base, "cabin_class": cabin, "slices": new_slices}},
+        })
+
+    if len(searches) > settings.fan_out_max_searches:
+        raise FanOutTooLarge(
+            f"Fan-out expands to {len(searches)} searches, the limit is {settings.fan_out_max_searches}"
+        )
+    return searches
+
+async def run_fan_out(body: OfferFanOutRequest) -> dict:
+    searches = build_searches(body)
+    semaphore = asyncio.Semaphore(settings.fan_out_concurrency)
+    started = time.perf_counter()
+
+    async def run(search):
+        async with semaphore:
+            search_started = time.perf_counter()
+            try:
+                result, error = await duffel.post("/air/offer_requests", search["payload"]), None
+            except Exception as e:
+                result, error = None, e
+            elapsed = time.perf_counter() - search_started
+        data = (result or {}).get("data") or {}
+        return search["variant"], data, error, elapsed
+
+    results = await asyncio.gather(*(run(search) for search in searches))
+    errors = [error for _, _, error, _ in results if error is not None]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+
+    # Keep the cheapest offer per (itinerary, cabin) across all searches
+    best = {}
+    summaries = []
+    for variant, data, error, elapsed in results:
+        offers = data.get("offers") or []
+        summaries.append({
+            **variant,
+            "offer_request_id": data.get("id"),
+            "offers": len(offers),
+            "duration_ms": round(elapsed * 1000, 1),
+            "error": error_body(error) if error else None,
+        })
+        for offer in offers:
+            key = (itinerary_key(offer), variant["cabin_class"])
+            if key not in best or offer_amount(offer) < offer_amount(best[key]):
+                best[key] = offer
+
+    offers = sorted(best.values(), key=offer_amount)
+    return {
+        "offers": offers,
+        "searches": summaries,
+        "meta": {
+            "searches": len(searches),
+            "failed": sum(1 for s in summaries if s["error"]),
+            "offers_before_dedup": sum(s["offers"] for s in summaries),
+            "offers": len(offers),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+    }
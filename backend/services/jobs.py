@@ -0,0 +1,150 @@
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from backend.config import settings
+from backend.utils.error_handlers import error_body
+
+class JobNotFound(LookupError):
+    type = "not_found_error"
+    status_code = 404
+
+class JobQueueFull(Exception):
+    type = "service_unavailable"
+    status_code = 503
+    retry_after = 5
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class Job:
+    __slots__ = (
+        "id", "kind", "status", "created_at", "started_at", "finished_at",
+        "result", "error", "expires_at", "done", "task",
+    )
+
+    def __init__(self, kind: str):
+        self.id = f"job_{secrets.token_hex(12)}"
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.expires_at = None
+        self.done = asyncio.Event()
+        self.task = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class JobManager:
+    """
+    Runs slow upstream calls off the request path. At most `concurrency`
+    jobs run at once and at most `max_pending` wait behind them; finished
+    jobs keep their result for `result_ttl` seconds.
+    """
+    def __init__(self, concurrency: int, max_pending: int, result_ttl: float):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs = OrderedDict()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def _purge(self):
+        now = time.monotonic()
+        for job_id in [j.id for j in self._jobs.values() if j.expires_at is not None and j.expires_at <= now]:
+            del self._jobs[job_id]
+            self.expired += 1
+
+    def pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+
+    def submit(self, kind: str, fn) -> Job:
+        """
+        Schedules `fn()` (a coroutine function) and returns its job at once.
+        """
+        self._purge()
+        if self.pending() >= self.max_pending:
+            self.rejected += 1
+            raise JobQueueFull(f"Too many pending jobs ({self.max_pending}), retry later")
+        job = Job(kind)
+        self._jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, fn))
+        self.submitted += 1
+        return job
+
+    async def _run(self, job: Job, fn):
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = _now()
+                job.result = await fn()
+                job.status = "succeeded"
+                self.succeeded += 1
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = {"message": "Job cancelled", "type": "cancelled", "details": None}
+            self.failed += 1
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = error_body(e)
+            self.failed += 1
+        finally:
+            job.finished_at = _now()
+            job.expires_at = time.monotonic() + self.result_ttl
+            job.done.set()
+
+    def get(self, job_id: str) -> Job:
+        self._purge()
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFound(f"Job {job_id} not found or expired")
+        return job
+
+    async def wait(self, job_id: str, timeout: float = 0) -> Job:
+        """
+        The job, after waiting up to `timeout` seconds for it to finish.
+        """
+        job = self.get(job_id)
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def stop(self):
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._jobs),
+            "pending": self.pending(),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
+
+jobs = JobManager(settings.job_concurrency, settings.job_max_pending, settings.job_result_ttl)
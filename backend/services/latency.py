@@ -0,0 +1,85 @@
+from collections import deque
+from backend.config import settings
+
+# Duffel holds these open until there is something new to return, so
+# their response time is not a latency and they keep the fixed timeout
+LONG_POLL_ENDPOINTS = {"GET batch_offer_requests/{id}"}
+
+def endpoint_key(method: str, path: str) -> str:
+    """
+    "GET /air/offers/off_123" -> "GET offers/{id}": one key per endpoint,
+    however many ids it is called with.
+    """
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    resource = parts[1] if len(parts) > 1 else parts[0]
+    suffix = "/{id}" + "".join(f"/{p}" for p in parts[3:]) if len(parts) > 2 else ""
+    return f"{method} {resource}{suffix}"
+
+class LatencyWindow:
+    """
+    The last `size` response times of one endpoint, in seconds.
+    """
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size: int):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+class LatencyTracker:
+    """
+    Rolling per-endpoint latency percentiles. Once an endpoint has enough
+    samples its timeout becomes a multiple of its own p99 (within the
+    configured floor and the fixed duffel_timeout ceiling), and its p95 is
+    the point after which a hedged GET sends a second request.
+    """
+    def __init__(self, window: int, min_samples: int):
+        self.window = window
+        self.min_samples = min_samples
+        self._windows = {}
+
+    def observe(self, key: str, seconds: float):
+        if key in LONG_POLL_ENDPOINTS:
+            return
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = LatencyWindow(self.window)
+        window.observe(seconds)
+
+    def _ready(self, key: str):
+        window = self._windows.get(key)
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        return window
+
+    def timeout_for(self, key: str) -> float:
+        window = self._ready(key)
+        if window is None or not settings.duffel_adaptive_timeouts:
+            return settings.duffel_timeout
+        timeout = window.percentile(0.99) * settings.duffel_timeout_multiplier
+        return min(max(timeout, settings.duffel_min_timeout), settings.duffel_timeout)
+
+    def hedge_delay(self, key: str):
+        window = self._ready(key)
+        return None if window is None else window.percentile(0.95)
+
+    def stats(self) -> dict:
+        return {
+            key: {
+                "samples": window.count,
+                "p50_ms": round(window.percentile(0.5) * 1000, 1),
+                "p95_ms": round(window.percentile(0.95) * 1000, 1),
+                "p99_ms": round(window.percentile(0.99) * 1000, 1),
+                "timeout_s": round(self.timeout_for(key), 2),
+            }
+            for key, window in self._windows.items() if window.samples
+        }
+
+latency = LatencyTracker(settings.latency_window, settings.latency_min_samples)
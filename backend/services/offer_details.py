@@ -0,0 +1,63 @@
+from backend.models.compact import CompactOffer
+from backend.models.seat_grid import SeatGrid
+from backend.services.duffel_client import duffel
+from backend.services.read_model import read_model
+from backend.services.response_cache import response_cache
+from backend.utils import json_codec
+from backend.utils.dates import seconds_until
+
+def _offer_ttl(result):
+    # Offers are immutable until they expire
+    return seconds_until((result.get("data") or {}).get("expires_at"))
+
+async def fetch_offer(offer_id: str):
+    # Cached as a CompactOffer and expanded again on every hit
+    key = ("offer", offer_id)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return {"data": cached.to_dict()}
+    result = await duffel.get(f"/air/offers/{offer_id}", hedge=True)
+    data = result.get("data")
+    if isinstance(data, dict):
+        response_cache.set(
+            key,
+            CompactOffer(data),
+            ttl=_offer_ttl(result),
+            tags=(offer_id,),
+            size=len(json_codec.dumps(result)),
+        )
+    return result
+
+async def fetch_seat_maps(offer_id: str):
+    # Seat maps carry no expiry of their own; they live as long as the offer
+    return await response_cache.get_or_fetch(
+        ("seat_maps", offer_id),
+        lambda: duffel.get("/air/seat_maps", {"offer_id": offer_id}, hedge=True),
+        ttl_for=lambda result: response_cache.expires_in(("offer", offer_id)),
+        tags=(offer_id,),
+    )
+
+async def fetch_seat_grid(offer_id: str) -> SeatGrid:
+    key = ("seat_grid", offer_id)
+    grid = response_cache.get(key)
+    if grid is None:
+        seat_maps = await fetch_seat_maps(offer_id)
+        grid = SeatGrid.from_seat_maps(seat_maps.get("data"))
+        response_cache.set(
+            key,
+            grid,
+            ttl=response_cache.expires_in(("seat_maps", offer_id)),
+            tags=(offer_id,),
+            size=grid.nbytes(),
+        )
+    return grid
+
+def invalidate_order(order_id: str = None, offer_ids=()):
+    """
+    Drops cached entries touched by a write to an order.
+    """
+    for offer_id in offer_ids or ():
+        response_cache.invalidate_tag(offer_id)
+    if order_id:
+        response_cache.invalidate_tag(order_id)
+        read_model.expire(order_id)
@@ -0,0 +1,284 @@
+import base64
+import time
+from array import array
+from collections import OrderedDict
+from backend.config import settings
+from backend.models.compact import CompactOffer, Reference
+from backend.services.duffel_client import duffel
+from backend.services.single_flight import SingleFlight
+from backend.utils.dates import minute_of_day, seconds_until
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SORT_COLUMNS = {
+    "total_amount": "price",
+    "total_duration": "duration",
+    "stops": "stops",
+    "departure": "departure",
+}
+
+# Stands in for missing integer values; sorts last either way
+_MISSING = 2**31 - 1
+
+def _missing(column: array):
+    # Prices are floats and use inf for a missing amount
+    return float("inf") if column.typecode == "d" else _MISSING
+
+class InvalidOfferQuery(ValueError):
+    type = "validation_error"
+    status_code = 422
+
+class OfferQuery:
+    __slots__ = (
+        "min_price", "max_price", "max_stops", "max_duration",
+        "airlines", "departure_after", "departure_before",
+    )
+
+    def __init__(self, min_price=None, max_price=None, max_stops=None, max_duration=None,
+                 airlines=None, departure_after=None, departure_before=None):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.max_stops = max_stops
+        self.max_duration = max_duration
+        self.airlines = airlines
+        self.departure_after = departure_after
+        self.departure_before = departure_before
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, name) is None for name in self.__slots__)
+
+def _slice_stops(offer: CompactOffer) -> int:
+    return max((len(s.segments) - 1 for s in offer.slices), default=0)
+
+def _total_duration(offer: CompactOffer) -> int:
+    minutes = offer.total_duration
+    return _MISSING if minutes is None else minutes
+
+def _departure(offer: CompactOffer) -> int:
+    if not offer.slices or not offer.slices[0].segments:
+        return _MISSING
+    minute = minute_of_day(offer.slices[0].segments[0].departing_at)
+    return _MISSING if minute is None else minute
+
+def _carrier_code(offer: CompactOffer):
+    owner = offer.owner
+    return owner.iata_code if isinstance(owner, Reference) else (owner or {}).get("iata_code")
+
+def _view(column: array):
+    # Zero-copy NumPy view; array and NumPy share the "d"/"l" type codes
+    return np.frombuffer(column, dtype=column.typecode)
+
+def _hhmm(value):
+    if value is None:
+        return None
+    hours, _, minutes = value.partition(":")
+    try:
+        return int(hours) * 60 + int(minutes or 0)
+    except ValueError:
+        raise InvalidOfferQuery(f"Expected HH:MM, got '{value}'")
+
+class OfferIndex:
+    """
+    Column-per-attribute view of one offer request's offers. Filters and
+    sorts run over packed arrays (vectorized with NumPy when installed);
+    offers are held as CompactOffer and only expanded for the page returned.
+    """
+    def __init__(self, offer_request_id: str, offers: list):
+        self.offer_request_id = offer_request_id
+        self.offers = [CompactOffer(offer) for offer in offers]
+        self.carriers = []
+        carrier_ids = {}
+
+        self.price = array("d")
+        self.duration = array("l")
+        self.stops = array("l")
+        self.departure = array("l")
+        self.carrier = array("l")
+        expiries = []
+        for offer in self.offers:
+            code = _carrier_code(offer)
+            if code not in carrier_ids:
+                carrier_ids[code] = len(self.carriers)
+                self.carriers.append(code)
+            self.price.append(offer.total)
+            self.duration.append(_total_duration(offer))
+            self.stops.append(_slice_stops(offer))
+            self.departure.append(_departure(offer))
+            self.carrier.append(carrier_ids[code])
+            expires_in = seconds_until(offer.expires_at)
+            if expires_in is not None:
+                expiries.append(expires_in)
+        self.carrier_ids = carrier_ids
+
+        ttl = min([settings.offer_index_max_ttl] + expiries)
+        self.expires_at = time.monotonic() + ttl
+
+    def __len__(self):
+        return len(self.offers)
+
+    def _bounds(self, query: OfferQuery):
+        """
+        (column, lower, upper) triples plus the allowed carrier ids.
+        """
+        bounds = [
+            (self.price, query.min_price, query.max_price),
+            (self.stops, None, query.max_stops),
+            (self.duration, None, query.max_duration),
+            (self.departure, _hhmm(query.departure_after), _hhmm(query.departure_before)),
+        ]
+        carriers = None
+        if query.airlines:
+            carriers = {self.carrier_ids[code] for code in query.airlines if code in self.carrier_ids}
+        return [b for b in bounds if b[1] is not None or b[2] is not None], carriers
+
+    def _select_numpy(self, query: OfferQuery, sort: str):
+        bounds, carriers = self._bounds(query)
+        mask = np.ones(len(self.offers), dtype=bool)
+        for column, lower, upper in bounds:
+            values = _view(column)
+            if lower is not None:
+                mask &= values >= lower
+            if upper is not None:
+                mask &= values <= upper
+        if carriers is not None:
+            mask &= np.isin(_view(self.carrier), list(carriers))
+        selected = np.flatnonzero(mask)
+        if sort:
+            column = getattr(self, SORT_COLUMNS[sort.lstrip("-")])
+            values = _view(column)[selected]
+            if sort.startswith("-"):
+                # Descending over the known values only, so missing ones stay last
+                missing = values == _missing(column)
+                known = selected[~missing]
+                order = np.argsort(-values[~missing], kind="stable")
+                selected = np.concatenate([known[order], selected[missing]])
+            else:
+                selected = selected[np.argsort(values, kind="stable")]
+        return selected.tolist()
+
+    def _select_python(self, query: OfferQuery, sort: str):
+        bounds, carriers = self._bounds(query)
+        selected = range(len(self.offers))
+        for column, lower, upper in bounds:
+            selected = [
+                i for i in selected
+                if (lower is None or column[i] >= lower) and (upper is None or column[i] <= upper)
+            ]
+        if carriers is not None:
+            selected = [i for i in selected if self.carrier[i] in carriers]
+        selected = list(selected)
+        if sort:
+            column = getattr(self, SORT_COLUMNS[sort.lstrip("-")])
+            if sort.startswith("-"):
+                missing = _missing(column)
+                known = [i for i in selected if column[i] != missing]
+                # A stable descending sort, with missing values kept last
+                known.sort(key=column.__getitem__, reverse=True)
+                selected = known + [i for i in selected if column[i] == missing]
+            else:
+                selected.sort(key=column.__getitem__)
+        return selected
+
+    def _ordered(self, query: OfferQuery, sort: str = None) -> list:
+        if sort and sort.lstrip("-") not in SORT_COLUMNS:
+            raise InvalidOfferQuery(f"Unsupported sort '{sort}', use one of {sorted(SORT_COLUMNS)}")
+        select = self._select_numpy if np is not None else self._select_python
+        return select(query, sort)
+
+    def select(self, query: OfferQuery, sort: str = None) -> list:
+        """
+        Every offer matching `query`, in `sort` order.
+        """
+        return [self.offers[i].to_dict() for i in self._ordered(query, sort)]
+
+    def query(self, query: OfferQuery, sort: str = None, limit: int = 50, after: str = None) -> dict:
+        page, meta = paginate(self._ordered(query, sort), limit, after)
+        meta["indexed"] = len(self.offers)
+        return {"data": [self.offers[i].to_dict() for i in page], "meta": meta}
+
+def paginate(items: list, limit: int, after: str = None):
+    """
+    Slices a fully ordered list with opaque offset cursors.
+    """
+    start = decode_cursor(after)
+    page = items[start:start + limit]
+    end = start + len(page)
+    return page, {
+        "limit": limit,
+        "after": encode_cursor(end) if end < len(items) else None,
+        "before": encode_cursor(max(start - limit, 0)) if start > 0 else None,
+        "total": len(items),
+    }
+
+# Tells the index's own cursors apart from Duffel's, which are passed upstream
+CURSOR_PREFIX = "ix_"
+
+def is_index_cursor(cursor: str) -> bool:
+    return bool(cursor) and cursor.startswith(CURSOR_PREFIX)
+
+def encode_cursor(offset: int) -> str:
+    return CURSOR_PREFIX + base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    if not cursor:
+        return 0
+    if not is_index_cursor(cursor):
+        raise InvalidOfferQuery("Invalid pagination cursor")
+    cursor = cursor[len(CURSOR_PREFIX):]
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        return max(int(raw.split(":", 1)[1]), 0)
+    except (ValueError, IndexError):
+        raise InvalidOfferQuery("Invalid pagination cursor")
+
+class OfferIndexStore:
+    """
+    Holds the most recently used offer indexes until their offers expire.
+    """
+    def __init__(self, max_requests: int):
+        self.max_requests = max_requests
+        self._indexes = OrderedDict()
+        self._builds = SingleFlight()
+        self.builds = 0
+        self.evictions = 0
+
+    def get(self, offer_request_id: str):
+        index = self._indexes.get(offer_request_id)
+        if index is None:
+            return None
+        if index.expires_at <= time.monotonic():
+            del self._indexes[offer_request_id]
+            self.evictions += 1
+            return None
+        self._indexes.move_to_end(offer_request_id)
+        return index
+
+    async def load(self, offer_request_id: str) -> OfferIndex:
+        index = self.get(offer_request_id)
+        if index is not None:
+            return index
+        return await self._builds.do(offer_request_id, lambda: self._build(offer_request_id))
+
+    async def _build(self, offer_request_id: str) -> OfferIndex:
+        offers = [offer async for offer in duffel.paginate("/air/offers", {"offer_request_id": offer_request_id})]
+        index = OfferIndex(offer_request_id, offers)
+        self.builds += 1
+        self._indexes[offer_request_id] = index
+        while len(self._indexes) > self.max_requests:
+            self._indexes.popitem(last=False)
+            self.evictions += 1
+        return index
+
+    def stats(self) -> dict:
+        return {
+            "indexes": len(self._indexes),
+            "offers": sum(len(index) for index in self._indexes.values()),
+            "builds": self.builds,
+            "evictions": self.evictions,
+            "vectorized": np is not None,
+        }
+
+offer_indexes = OfferIndexStore(settings.offer_index_max_requests)
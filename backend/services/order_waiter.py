@@ -0,0 +1,145 @@
+import asyncio
+import time
+from backend.config import settings
+from backend.services.duffel_client import duffel
+
+CONDITIONS = {
+    "documents_issued": lambda order: bool(order.get("documents")),
+    "paid": lambda order: (order.get("payment_status") or {}).get("awaiting_payment") is False,
+    "cancelled": lambda order: bool(order.get("cancelled_at")),
+}
+
+class OrderWaitTimeout(Exception):
+    type = "timeout_error"
+    status_code = 504
+
+class OrderPoller:
+    """
+    The one upstream poll loop for an order, shared by everyone waiting on
+    it. Each new snapshot of the order wakes all waiters.
+    """
+    def __init__(self, order_id: str):
+        self.order_id = order_id
+        self.order = None
+        self.error = None
+        self.waiters = 0
+        self.polls = 0
+        self.task = None
+        self._updated = asyncio.Event()
+        self._wake = asyncio.Event()
+
+    def publish(self, order: dict = None, error: Exception = None):
+        if order is not None:
+            self.order = order
+        self.error = error
+        # Swap in a fresh event so late waiters block until the next update
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    def wake(self):
+        self._wake.set()
+
+    async def updated(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def run(self):
+        delay = settings.order_poll_interval
+        while True:
+            try:
+                result = await duffel.get(f"/air/orders/{self.order_id}", coalesce=False)
+                order = result.get("data") or {}
+                # Back off while nothing changes, start over when it does
+                if order != self.order:
+                    delay = settings.order_poll_interval
+                else:
+                    delay = min(delay * 2, settings.order_poll_max_interval)
+                self.polls += 1
+                self.publish(order)
+            except Exception as e:
+                delay = min(max(delay * 2, getattr(e, "retry_after", 0) or 0), settings.order_poll_max_interval)
+                self.publish(error=e)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+class OrderWaiter:
+    """
+    Holds callers until an order reaches a state, polling Duffel at most
+    once per order however many callers wait on it. `notify` lets other
+    parts of the gateway push a fresher order or trigger an early poll.
+    """
+    def __init__(self):
+        self._pollers = {}
+        self.waits = 0
+        self.satisfied = 0
+        self.timeouts = 0
+        self.notified = 0
+        self.polls = 0
+
+    async def wait(self, order_id: str, until: str, timeout: float):
+        """
+        Returns (order, satisfied) as soon as `until` holds for the order,
+        or with satisfied=False once `timeout` seconds have passed.
+        """
+        condition = CONDITIONS[until]
+        poller = self._pollers.get(order_id)
+        if poller is None:
+            poller = self._pollers[order_id] = OrderPoller(order_id)
+        if poller.task is None or poller.task.done():
+            poller.task = asyncio.ensure_future(poller.run())
+        poller.waiters += 1
+        self.waits += 1
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                if poller.order is not None and condition(poller.order):
+                    self.satisfied += 1
+                    return poller.order, True
+                if poller.order is None and poller.error is not None:
+                    raise poller.error
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not await poller.updated(remaining):
+                    if poller.order is None:
+                        # Not even one poll came back in time
+                        raise OrderWaitTimeout(f"Timed out waiting for order {order_id}")
+                    self.timeouts += 1
+                    return poller.order, False
+        finally:
+            poller.waiters -= 1
+            if poller.waiters == 0:
+                poller.task.cancel()
+                self.polls += poller.polls
+                if self._pollers.get(order_id) is poller:
+                    del self._pollers[order_id]
+
+    def notify(self, order_id: str, order: dict = None):
+        """
+        Hands waiters a fresher order, or asks the poller to poll now.
+        """
+        poller = self._pollers.get(order_id)
+        if poller is None:
+            return
+        self.notified += 1
+        if order is not None:
+            poller.publish(order)
+        else:
+            poller.wake()
+
+    def stats(self) -> dict:
+        return {
+            "orders": len(self._pollers),
+            "waiters": sum(p.waiters for p in self._pollers.values()),
+            "polls": self.polls + sum(p.polls for p in self._pollers.values()),
+            "waits": self.waits,
+            "satisfied": self.satisfied,
+            "timeouts": self.timeouts,
+            "notified": self.notified,
+        }
+
+order_waiter = OrderWaiter()
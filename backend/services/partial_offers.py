@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import OrderedDict
+from backend.config import settings
+from backend.services.duffel_client import duffel
+from backend.services.rate_limit import endpoint_family, rate_limiter
+from backend.services.single_flight import SingleFlight
+from backend.utils.dates import seconds_until
+
+# Upstream resource per kind of node lookup
+KINDS = {
+    "offers": "/air/partial_offer_requests/{id}",
+    "fares": "/air/partial_offer_requests/{id}/fares",
+}
+
+def _ttl(result: dict) -> float:
+    # A node is only as fresh as the partial offers it lists
+    data = result.get("data") or {}
+    offers = data.get("offers") if isinstance(data, dict) else data
+    expiries = [seconds_until(offer.get("expires_at")) for offer in offers or [] if isinstance(offer, dict)]
+    if isinstance(data, dict):
+        expiries.append(seconds_until(data.get("expires_at")))
+    return min([settings.partial_offer_cache_max_ttl] + [e for e in expiries if e is not None])
+
+def _offer_ids(result: dict) -> list:
+    data = result.get("data") or {}
+    offers = data.get("offers") if isinstance(data, dict) else data
+    return [offer.get("id") for offer in offers or [] if isinstance(offer, dict) and offer.get("id")]
+
+class SelectionNode:
+    """
+    One point in a partial offer request's selection path. Children are
+    keyed by the partial offer selected next.
+    """
+    __slots__ = ("children", "results")
+
+    def __init__(self):
+        self.children = {}
+        # kind -> (result, monotonic expiry)
+        self.results = {}
+
+    def child(self, offer_id: str) -> "SelectionNode":
+        node = self.children.get(offer_id)
+        if node is None:
+            node = self.children[offer_id] = SelectionNode()
+        return node
+
+    def size(self) -> int:
+        return 1 + sum(child.size() for child in self.children.values())
+
+class PartialOfferTree:
+    """
+    Prefix-tree cache for partial offer request navigation: one tree per
+    partial offer request, one node per ordered selection path. Stepping
+    back to an earlier choice is answered locally, and once a slice is
+    chosen its sibling choices are fetched in the background.
+    """
+    def __init__(self, max_requests: int, siblings: int, concurrency: int):
+        self.max_requests = max_requests
+        self.siblings = siblings
+        self._trees = OrderedDict()
+        self._tasks = {}
+        self._fetches = SingleFlight()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+
+    def _root(self, request_id: str) -> SelectionNode:
+        root = self._trees.get(request_id)
+        if root is None:
+            root = self._trees[request_id] = SelectionNode()
+            while len(self._trees) > self.max_requests:
+                oldest, _ = self._trees.popitem(last=False)
+                self._cancel(oldest)
+                self.evictions += 1
+        self._trees.move_to_end(request_id)
+        return root
+
+    def _node(self, request_id: str, path: tuple) -> SelectionNode:
+        node = self._root(request_id)
+        for offer_id in path:
+            node = node.child(offer_id)
+        return node
+
+    def _cached(self, node: SelectionNode, kind: str):
+        entry = node.results.get(kind)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at <= time.monotonic():
+            del node.results[kind]
+            return None
+        return result
+
+    async def get(self, request_id: str, path=(), kind: str = "offers") -> dict:
+        """
+        The upstream result for `kind` at the selection `path`.
+        """
+        path = tuple(path or ())
+        result = self._cached(self._node(request_id, path), kind)
+        if result is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            result = await self._fetch(request_id, path, kind)
+        if path:
+            self._prefetch_siblings(request_id, path, kind)
+        return result
+
+    async def _fetch(self, request_id: str, path: tuple, kind: str) -> dict:
+        async def fetch():
+            params = {"selected_partial_offer[]": list(path)} if path else None
+            result = await duffel.get(KINDS[kind].format(id=request_id), params)
+            # The tree may have been evicted meanwhile; _node recreates the path
+            self._node(request_id, path).results[kind] = (result, time.monotonic() + _ttl(result))
+            return result
+        return await self._fetches.do((request_id, path, kind), fetch)
+
+    def _prefetch_siblings(self, request_id: str, path: tuple, kind: str):
+        parent = self._cached(self._node(request_id, path[:-1]), "offers")
+        if parent is None or self.siblings <= 0:
+            return
+        siblings = [s for s in _offer_ids(parent) if s != path[-1]][:self.siblings]
+        pending = [
+            path[:-1] + (s,) for s in siblings
+            if self._cached(self._node(request_id, path[:-1] + (s,)), kind) is None
+        ]
+        if not pending:
+            return
+        tasks = self._tasks.setdefault(request_id, set())
+        for sibling_path in pending:
+            task = asyncio.ensure_future(self._prefetch(request_id, sibling_path, kind))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def _prefetch(self, request_id: str, path: tuple, kind: str):
+        async with self._semaphore:
+            bucket = rate_limiter.bucket(endpoint_family(KINDS[kind]))
+            if bucket.headroom() < settings.prefetch_min_headroom:
+                return
+            try:
+                await self._fetch(request_id, path, kind)
+                self.prefetched += 1
+            except Exception:
+                pass
+
+    def _cancel(self, request_id: str):
+        for task in self._tasks.pop(request_id, ()):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "requests": len(self._trees),
+            "nodes": sum(root.size() for root in self._trees.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefetched": self.prefetched,
+            "prefetching": sum(len(tasks) for tasks in self._tasks.values()),
+            "evictions": self.evictions,
+        }
+
+partial_offer_tree = PartialOfferTree(
+    settings.partial_offer_cache_max_requests,
+    settings.partial_offer_prefetch_siblings,
+    settings.prefetch_concurrency,
+)
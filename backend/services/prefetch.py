@@ -0,0 +1,112 @@
+import asyncio
+from collections import OrderedDict
+from starlette.background import BackgroundTask
+from backend.config import settings
+from backend.services.offer_details import fetch_offer, fetch_seat_grid
+from backend.services.rate_limit import endpoint_family, rate_limiter
+from backend.services.response_cache import response_cache
+
+def _is_warm(offer_id: str) -> bool:
+    expires_in = response_cache.expires_in(("seat_grid", offer_id))
+    return expires_in is not None and expires_in > 0
+
+class PrefetchScheduler:
+    """
+    Warms the offer-detail and seat-map caches for the offers a user is
+    most likely to open next. Runs in the background at low priority: a
+    small concurrency cap, and nothing is fetched while the search rate
+    limit budget is running low. Only offers the gateway has already seen
+    in a listing are warmed, so prefetching never issues searches of its
+    own. Re-listing an offer request, or replacing it with a new search,
+    cancels the warm-up still pending for it; past `max_requests` pending
+    groups the least recently scheduled is dropped.
+    """
+    def __init__(self, top_offers: int, concurrency: int, max_requests: int, min_headroom: float):
+        self.top_offers = top_offers
+        self.max_requests = max_requests
+        self.min_headroom = min_headroom
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._groups = OrderedDict()
+        self.scheduled = 0
+        self.warmed = 0
+        self.already_warm = 0
+        self.skipped_busy = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    async def schedule(self, offer_request_id: str, offer_ids: list):
+        """
+        Starts warming the top `offer_ids` of `offer_request_id` without
+        waiting for it to finish.
+        """
+        self.cancel(offer_request_id)
+        offer_ids = [offer_id for offer_id in offer_ids if offer_id][:self.top_offers]
+        if not offer_ids:
+            return
+        task = asyncio.ensure_future(self._warm_request(offer_ids))
+        self._groups[offer_request_id] = task
+        task.add_done_callback(lambda t: self._forget(offer_request_id, t))
+        self.scheduled += 1
+        while len(self._groups) > self.max_requests:
+            self.cancel(next(iter(self._groups)))
+
+    def cancel(self, offer_request_id: str):
+        task = self._groups.pop(offer_request_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+            self.cancelled += 1
+
+    def _forget(self, offer_request_id: str, task):
+        if self._groups.get(offer_request_id) is task:
+            del self._groups[offer_request_id]
+
+    def _has_headroom(self) -> bool:
+        return rate_limiter.bucket(endpoint_family("/air/seat_maps")).headroom() >= self.min_headroom
+
+    async def _warm_request(self, offer_ids: list):
+        # Highest ranked first, so the likeliest pick is warm soonest
+        await asyncio.gather(*(self._warm_offer(offer_id) for offer_id in offer_ids))
+
+    async def _warm_offer(self, offer_id: str):
+        async with self._semaphore:
+            if _is_warm(offer_id):
+                self.already_warm += 1
+                return
+            if not self._has_headroom():
+                self.skipped_busy += 1
+                return
+            try:
+                # The offer first: seat maps take their TTL from it
+                await fetch_offer(offer_id)
+                await fetch_seat_grid(offer_id)
+                self.warmed += 1
+            except Exception:
+                self.failed += 1
+
+    def after_response(self, response, offer_request_id: str, offer_ids: list):
+        """
+        Attaches the warm-up to `response`, so it starts once the list has
+        been sent to the client.
+        """
+        if settings.prefetch_enabled and self.top_offers > 0:
+            response.background = BackgroundTask(self.schedule, offer_request_id, offer_ids)
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.prefetch_enabled,
+            "pending": len(self._groups),
+            "scheduled": self.scheduled,
+            "warmed": self.warmed,
+            "already_warm": self.already_warm,
+            "skipped_busy": self.skipped_busy,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+        }
+
+prefetcher = PrefetchScheduler(
+    settings.prefetch_top_offers,
+    settings.prefetch_concurrency,
+    settings.prefetch_max_requests,
+    settings.prefetch_min_headroom,
+)
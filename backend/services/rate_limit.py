@@ -0,0 +1,186 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from backend.config import settings
+
+# Duffel resource -> endpoint family that shares a rate-limit budget
+FAMILIES = {
+    "offer_requests": "search",
+    "offers": "search",
+    "partial_offer_requests": "search",
+    "batch_offer_requests": "search",
+    "seat_maps": "search",
+    "order_change_requests": "search",
+    "order_change_offers": "search",
+    "orders": "orders",
+    "order_cancellations": "orders",
+    "order_changes": "orders",
+    "airline_credits": "orders",
+    "payments": "payments",
+}
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when an outbound call would have to queue longer than allowed.
+    """
+    type = "rate_limit_error"
+    status_code = 429
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(f"Duffel rate limit reached for '{family}' endpoints, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+def endpoint_family(path: str) -> str:
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    resource = parts[1] if len(parts) > 1 else parts[0]
+    return FAMILIES.get(resource, "other")
+
+def _parse_seconds(value):
+    """
+    Reads a header that is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    # Some servers send an epoch timestamp instead of a delta
+    if seconds > 10**9:
+        return seconds - time.time()
+    return seconds
+
+def retry_after(headers) -> float:
+    seconds = _parse_seconds(headers.get("retry-after"))
+    if seconds is None:
+        seconds = _parse_seconds(headers.get("ratelimit-reset"))
+    return max(seconds or 0.0, 0.0)
+
+def backoff_delay(attempt: int, minimum: float = 0.0) -> float:
+    """
+    Exponential backoff with full jitter, never shorter than `minimum`.
+    """
+    ceiling = min(settings.duffel_retry_max_delay, settings.duffel_retry_base_delay * (2 ** attempt))
+    return max(minimum, random.uniform(0, ceiling))
+
+class TokenBucket:
+    def __init__(self, family: str, rate: float, capacity: int):
+        self.family = family
+        self.rate = rate
+        self.configured_rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.queued = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _wait_time(self, now: float) -> float:
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self, max_wait: float = None):
+        max_wait = settings.duffel_rate_limit_max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+        # The lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self.tokens -= 1
+                    break
+                if now - started + wait > max_wait:
+                    raise RateLimitExceeded(self.family, wait)
+                await asyncio.sleep(wait)
+        waited = time.monotonic() - started
+        self.acquired += 1
+        if waited > 0.001:
+            self.queued += 1
+            self.wait_seconds += waited
+
+    def update_from_headers(self, headers):
+        """
+        Re-syncs the bucket with Duffel's `ratelimit-*` response headers.
+        """
+        remaining = headers.get("ratelimit-remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = int(remaining)
+        except ValueError:
+            return
+        reset_in = _parse_seconds(headers.get("ratelimit-reset"))
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+        if reset_in is None or reset_in <= 0:
+            return
+        if remaining <= 0:
+            self.blocked_until = max(self.blocked_until, now + reset_in)
+        else:
+            # Spread what is left of the window evenly until it resets
+            self.rate = max(remaining / reset_in, self.configured_rate / 10)
+
+    def headroom(self) -> float:
+        """
+        Fraction of the burst currently available without waiting.
+        """
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return 0.0
+        self._refill(now)
+        return max(self.tokens, 0.0) / self.capacity
+
+    def pause(self, seconds: float):
+        self.throttled += 1
+        self.tokens = min(self.tokens, 1.0)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 2),
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "throttled": self.throttled,
+        }
+
+class RateLimiter:
+    def __init__(self, limits: dict):
+        self.buckets = {
+            family: TokenBucket(family, rate, capacity)
+            for family, (rate, capacity) in limits.items()
+        }
+
+    def bucket(self, family: str) -> TokenBucket:
+        return self.buckets.get(family) or self.buckets["other"]
+
+    def stats(self) -> dict:
+        return {family: bucket.stats() for family, bucket in self.buckets.items()}
+
+rate_limiter = RateLimiter({
+    "search": settings.duffel_rate_limit_search,
+    "orders": settings.duffel_rate_limit_orders,
+    "payments": settings.duffel_rate_limit_payments,
+    "other": settings.duffel_rate_limit_other,
+})
@@ -0,0 +1,334 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from fastapi import Query
+from backend.config import settings
+from backend.services.duffel_client import duffel
+from backend.utils import json_codec
+
+# Stored resource -> upstream list endpoint
+RESOURCES = {
+    "orders": "/air/orders",
+    "payments": "/air/payments",
+    "order_cancellations": "/air/order_cancellations",
+}
+
+# Shared `consistency` query parameter of the endpoints the read model serves
+CONSISTENCY_QUERY = Query("eventual", pattern="^(eventual|strong)$", description="strong always reads from Duffel")
+
+# Matches the page size duffel.paginate asks for
+SYNC_PAGE_SIZE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    created_at TEXT,
+    booking_reference TEXT,
+    awaiting_payment INTEGER,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_created_at ON orders (created_at);
+CREATE INDEX IF NOT EXISTS orders_booking_reference ON orders (booking_reference);
+CREATE INDEX IF NOT EXISTS orders_awaiting_payment ON orders (awaiting_payment);
+
+CREATE TABLE IF NOT EXISTS payments (
+    id TEXT PRIMARY KEY,
+    created_at TEXT,
+    order_id TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS payments_created_at ON payments (created_at);
+CREATE INDEX IF NOT EXISTS payments_order_id ON payments (order_id);
+
+CREATE TABLE IF NOT EXISTS order_cancellations (
+    id TEXT PRIMARY KEY,
+    created_at TEXT,
+    order_id TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS order_cancellations_created_at ON order_cancellations (created_at);
+CREATE INDEX IF NOT EXISTS order_cancellations_order_id ON order_cancellations (order_id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL
+);
+"""
+
+def _columns(resource: str, record: dict) -> dict:
+    columns = {"id": record.get("id"), "created_at": record.get("created_at")}
+    if resource == "orders":
+        awaiting = (record.get("payment_status") or {}).get("awaiting_payment")
+        columns["booking_reference"] = record.get("booking_reference")
+        columns["awaiting_payment"] = None if awaiting is None else int(awaiting)
+    else:
+        columns["order_id"] = record.get("order_id")
+    return columns
+
+class ReadModel:
+    """
+    Embedded SQLite copy of orders, payments and order cancellations.
+    Filled by write-through from the gateway's own calls, by webhooks and
+    by a background sync: incremental passes pick up newly created records
+    and every `full_sync_every`th pass refreshes all of them. A record is
+    served while its own copy is within READ_MODEL_MAX_STALENESS seconds
+    and not expired by a later write. A list is served while the last sync
+    is that recent and every record on it was seen by the last full sync
+    (or written since) and not expired after.
+    """
+    def __init__(self, path: str, sync_interval: float, max_staleness: float, full_sync_every: int):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.full_sync_every = full_sync_every
+        self._db = None
+        self._lock = threading.Lock()
+        self._sync_task = None
+        self._synced_at = {}
+        # resource -> when the last full sync started
+        self._full_synced_at = {}
+        # record id -> when a write made the stored copy outdated
+        self._expired = {}
+        self.reads = 0
+        self.writes = 0
+        self.syncs = 0
+        self.full_syncs = 0
+        self.stale_lists = 0
+        self.sync_errors = 0
+        self.last_error = None
+
+    async def open(self):
+        await asyncio.to_thread(self._open)
+        self._sync_task = asyncio.ensure_future(self._sync_forever())
+
+    def _open(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        for resource, synced_at in db.execute("SELECT resource, synced_at FROM sync_state"):
+            self._synced_at[resource] = synced_at
+        self._db = db
+
+    async def close(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+        if self._db is not None:
+            db, self._db = self._db, None
+            await asyncio.to_thread(db.close)
+
+    def _run(self, sql: str, args=(), many: bool = False):
+        with self._lock:
+            if many:
+                self._db.executemany(sql, args)
+                self._db.commit()
+                return None
+            return self._db.execute(sql, args).fetchall()
+
+    # Writes
+
+    async def record(self, resource: str, records):
+        """
+        Upserts upstream records. Never fails the caller: the read model is
+        a cache of Duffel, not the source of truth.
+        """
+        if self._db is None or not records:
+            return
+        if isinstance(records, dict):
+            records = [records]
+        rows = []
+        now = time.time()
+        for record in records:
+            if isinstance(record, dict) and record.get("id"):
+                columns = _columns(resource, record)
+                rows.append((*columns.values(), json_codec.dumps(record).decode(), now))
+        if not rows:
+            return
+        names = list(_columns(resource, {}).keys()) + ["data", "synced_at"]
+        sql = (
+            f"INSERT INTO {resource} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{n} = excluded.{n}' for n in names[1:])}"
+        )
+        try:
+            await asyncio.to_thread(self._run, sql, rows, True)
+            self.writes += len(rows)
+        except sqlite3.Error as e:
+            self.last_error = str(e)
+
+    def expire(self, record_id: str):
+        """
+        Marks the stored copy of a record as outdated after a write the
+        gateway knows about but has not seen the result of.
+        """
+        now = time.time()
+        self._expired[record_id] = now
+        if len(self._expired) > 10000:
+            # An expiry can go once get() ignores rows that old anyway and a
+            # full sync started after it has refreshed every row
+            watermark = min((self._full_synced_at.get(resource, 0) for resource in RESOURCES), default=0)
+            self._expired = {
+                k: t for k, t in self._expired.items()
+                if now - t <= self.max_staleness or t >= watermark
+            }
+
+    # Reads
+
+    def fresh(self, resource: str) -> bool:
+        synced_at = self._synced_at.get(resource)
+        return self._db is not None and synced_at is not None and time.time() - synced_at <= self.max_staleness
+
+    async def get(self, resource: str, record_id: str):
+        """
+        The stored record if it was written within the staleness bound and
+        not expired since, else None.
+        """
+        if self._db is None:
+            return None
+        rows = await asyncio.to_thread(self._run, f"SELECT data, synced_at FROM {resource} WHERE id = ?", (record_id,))
+        if not rows:
+            return None
+        data, synced_at = rows[0]
+        if time.time() - synced_at > self.max_staleness or self._is_expired(record_id, synced_at):
+            return None
+        self.reads += 1
+        return json_codec.loads(data)
+
+    def _is_expired(self, record_id: str, synced_at: float) -> bool:
+        return self._expired.get(record_id, 0) >= synced_at
+
+    async def fetch(self, resource: str, record_id: str, strong: bool = False) -> dict:
+        """
+        Read-through lookup of one record, as a Duffel {"data": ...} result.
+        """
+        if not strong:
+            record = await self.get(resource, record_id)
+            if record is not None:
+                return {"data": record}
+        result = await duffel.get(f"{RESOURCES[resource]}/{record_id}", hedge=True)
+        await self.record(resource, result.get("data"))
+        return result
+
+    async def list(self, resource: str, limit: int, order_id: str = None, sort: str = "created_at"):
+        """
+        Up to `limit` stored records, or None when the resource is not
+        fresh enough, `sort` is not one the store can answer, or a record
+        on the page predates the last full sync or was expired since.
+        """
+        watermark = self._full_synced_at.get(resource)
+        if watermark is None or not self.fresh(resource) or sort not in (None, "created_at", "-created_at"):
+            return None
+        sql = f"SELECT id, data, synced_at FROM {resource}"
+        args = []
+        if order_id:
+            sql += " WHERE order_id = ?"
+            args.append(order_id)
+        sql += f" ORDER BY created_at {'DESC' if sort == '-created_at' else 'ASC'}, id LIMIT ?"
+        args.append(limit)
+        rows = await asyncio.to_thread(self._run, sql, args)
+        # Rows are not re-checked against max_staleness: incremental syncs
+        # only revisit the newest records, so older ones age past it
+        if any(synced_at < watermark or self._is_expired(record_id, synced_at) for record_id, _, synced_at in rows):
+            # Served by Duffel instead, whose answer is written back
+            self.stale_lists += 1
+            return None
+        self.reads += 1
+        return [json_codec.loads(data) for _, data, _ in rows]
+
+    def meta(self, resource: str, limit: int) -> dict:
+        return {"limit": limit, "after": None, "before": None, "source": "read_model", "synced_at": self._synced_at.get(resource)}
+
+    # Background sync
+
+    async def _sync_forever(self):
+        passes = 0
+        while True:
+            full = self.full_sync_every > 0 and passes % self.full_sync_every == 0
+            passes += 1
+            for resource in RESOURCES:
+                try:
+                    await self.sync(resource, full=full)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.sync_errors += 1
+                    self.last_error = f"{resource}: {e}"
+            await asyncio.sleep(self.sync_interval)
+
+    async def sync(self, resource: str, full: bool = False):
+        """
+        Pulls records created since the stored `created_at` cursor. Duffel
+        lists these resources newest first, so once a full page of records
+        in a row is older than the cursor the rest is assumed to be known
+        already. That skips records changed upstream since they were
+        stored, so a `full` sync pages through everything instead. Changes
+        made outside the gateway that no webhook reports reach lists by the
+        next full sync.
+        """
+        path = RESOURCES[resource]
+        rows = await asyncio.to_thread(self._run, "SELECT cursor FROM sync_state WHERE resource = ?", (resource,))
+        cursor = rows[0][0] if rows else None
+        started = time.time()
+        newest = cursor
+        batch = []
+        older_in_a_row = 0
+        records = duffel.paginate(path)
+        try:
+            async for record in records:
+                created_at = record.get("created_at") or ""
+                if cursor and created_at < cursor:
+                    older_in_a_row += 1
+                    if older_in_a_row >= SYNC_PAGE_SIZE and not full:
+                        break
+                else:
+                    older_in_a_row = 0
+                newest = max(newest or "", created_at) or None
+                # Older records seen on the way still refresh their stored copy
+                batch.append(record)
+                if len(batch) >= SYNC_PAGE_SIZE:
+                    await self.record(resource, batch)
+                    batch = []
+        finally:
+            await records.aclose()
+        await self.record(resource, batch)
+        await asyncio.to_thread(
+            self._run,
+            "INSERT INTO sync_state (resource, cursor, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(resource) DO UPDATE SET cursor = excluded.cursor, synced_at = excluded.synced_at",
+            [(resource, newest, started)],
+            True,
+        )
+        self._synced_at[resource] = started
+        if full:
+            self._full_synced_at[resource] = started
+            self.full_syncs += 1
+        self.syncs += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._db is not None,
+            "path": self.path,
+            "fresh": {resource: self.fresh(resource) for resource in RESOURCES},
+            "synced_at": dict(self._synced_at),
+            "full_synced_at": dict(self._full_synced_at),
+            "reads": self.reads,
+            "writes": self.writes,
+            "syncs": self.syncs,
+            "full_syncs": self.full_syncs,
+            "stale_lists": self.stale_lists,
+            "sync_errors": self.sync_errors,
+            "last_error": self.last_error,
+        }
+
+read_model = ReadModel(
+    settings.read_model_path,
+    settings.read_model_sync_interval,
+    settings.read_model_max_staleness,
+    settings.read_model_full_sync_every,
+)
@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from backend.config import settings
+from backend.utils import json_codec
+
+class CacheEntry:
+    __slots__ = ("value", "size", "expires_at", "tags")
+
+    def __init__(self, value, size, expires_at, tags):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.tags = tags
+
+class ResponseCache:
+    """
+    In-process LRU cache bounded by an approximate byte budget.
+    Entries expire after their own TTL and can be dropped by tag.
+    """
+    def __init__(self, max_bytes: int, max_ttl: float):
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._tags = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def expires_in(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry.expires_at - time.monotonic()
+
+    def set(self, key, value, ttl: float = None, tags=(), size: int = None):
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        if size is None:
+            size = len(json_codec.dumps(value))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, tuple(tags))
+        self.bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_fetch(self, key, fetch, ttl_for=None, tags=()):
+        """
+        Returns the cached value or awaits `fetch()` and stores the result.
+        `ttl_for(value)` may derive the TTL from the payload itself.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = await fetch()
+        self.set(key, value, ttl=ttl_for(value) if ttl_for else None, tags=tags)
+        return value
+
+    def invalidate(self, key):
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_tag(self, tag):
+        for key in list(self._tags.get(tag, ())):
+            self.invalidate(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    max_ttl=settings.response_cache_max_ttl,
+)
@@ -0,0 +1,36 @@
+import asyncio
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key onto one in-flight future.
+    """
+    def __init__(self):
+        self._inflight = {}
+        self.leaders = 0
+        self.collapsed = 0
+
+    async def do(self, key, fn):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.collapsed += 1
+        else:
+            self.leaders += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        # Shielded so one caller going away does not cancel the shared call
+        return await asyncio.shield(future)
+
+    def _forget(self, key, future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved even if every caller left
+            future.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "collapsed": self.collapsed,
+        }
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from backend.config import settings
+from backend.services.offer_details import invalidate_order
+from backend.services.order_waiter import order_waiter
+from backend.services.read_model import read_model
+from backend.utils import json_codec
+
+class InvalidWebhookSignature(Exception):
+    type = "authentication_error"
+    status_code = 401
+
+class WebhookBackpressure(Exception):
+    """
+    The event queue is full; Duffel redelivers on any non-2xx reply.
+    """
+    type = "service_unavailable"
+    status_code = 503
+    retry_after = 5
+
+class InvalidWebhookEvent(ValueError):
+    """
+    A correctly signed body that is not a JSON event object.
+    """
+    type = "validation_error"
+    status_code = 400
+
+def parse_event(body: bytes) -> dict:
+    try:
+        event = json_codec.loads(body)
+    except Exception:
+        # Each JSON backend raises its own decode error type
+        raise InvalidWebhookEvent("Webhook body is not valid JSON")
+    if not isinstance(event, dict):
+        raise InvalidWebhookEvent("Webhook body must be a JSON object")
+    return event
+
+def verify_signature(body: bytes, header: str, secret: str = None, tolerance: float = None):
+    """
+    Checks an `X-Duffel-Signature: t=<unix time>,v1=<hex>` header, where
+    v1 is the HMAC-SHA256 of "<t>.<raw body>" under the webhook secret.
+    """
+    secret = settings.duffel_webhook_secret if secret is None else secret
+    tolerance = settings.webhook_signature_tolerance if tolerance is None else tolerance
+    if not secret:
+        raise InvalidWebhookSignature("Webhook secret is not configured")
+    parts = dict(item.split("=", 1) for item in (header or "").split(",") if "=" in item)
+    timestamp, signature = parts.get("t"), parts.get("v1")
+    if not timestamp or not signature:
+        raise InvalidWebhookSignature("Missing or malformed X-Duffel-Signature header")
+    try:
+        age = abs(time.time() - int(timestamp))
+    except ValueError:
+        raise InvalidWebhookSignature("Malformed signature timestamp")
+    if age > tolerance:
+        raise InvalidWebhookSignature("Signature timestamp is outside the allowed window")
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidWebhookSignature("Signature does not match")
+
+def event_order_id(event: dict):
+    obj = (event.get("data") or {}).get("object") or {}
+    object_id = obj.get("id") or ""
+    return object_id if object_id.startswith("ord_") else obj.get("order_id")
+
+class WebhookPipeline:
+    """
+    Accepts webhook events without doing any work on the request path:
+    events are deduplicated by id, queued on a bounded queue and applied
+    in batches by background workers, which invalidate cached order data
+    and wake anyone waiting on the order.
+    """
+    def __init__(self, queue_size: int, workers: int, batch_size: int, dedup_size: int):
+        self.queue_size = queue_size
+        self.workers = workers
+        self.batch_size = batch_size
+        self.dedup_size = dedup_size
+        self._queue = None
+        self._tasks = []
+        self._seen = OrderedDict()
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.processed = 0
+        self.batches = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.lag_seconds = 0.0
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, event: dict) -> bool:
+        """
+        Queues `event` and returns True, or False for an id already seen.
+        Raises WebhookBackpressure when the queue is full.
+        """
+        self.received += 1
+        event_id = event.get("id")
+        if event_id in self._seen:
+            self._seen.move_to_end(event_id)
+            self.duplicates += 1
+            return False
+        if self._queue is None:
+            # Pipeline not started (e.g. outside the app lifespan)
+            raise WebhookBackpressure("Webhook pipeline is not running")
+        try:
+            self._queue.put_nowait((time.monotonic(), event))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            raise WebhookBackpressure("Webhook queue is full, retry later")
+        if event_id:
+            self._seen[event_id] = True
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _work(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.apply([event for _, event in batch])
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"Webhook batch failed: {e}")
+            now = time.monotonic()
+            self.lag_seconds = max(now - received for received, _ in batch)
+            self.processed += len(batch)
+            self.batches += 1
+            for _ in batch:
+                self._queue.task_done()
+
+    async def apply(self, events: list):
+        # Several events for one order in a batch collapse to one refresh.
+        # Events that do not carry the order itself make waiters re-poll.
+        orders = {}
+        for event in events:
+            order_id = event_order_id(event)
+            if not order_id:
+                continue
+            obj = (event.get("data") or {}).get("object") or {}
+            orders[order_id] = obj if obj.get("id") == order_id else None
+        for order_id, order in orders.items():
+            invalidate_order(order_id)
+            order_waiter.notify(order_id, order)
+        await read_model.record("orders", [order for order in orders.values() if order])
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "batches": self.batches,
+            "failed": self.failed,
+            "lag_seconds": round(self.lag_seconds, 3),
+        }
+
+webhook_pipeline = WebhookPipeline(
+    settings.webhook_queue_size,
+    settings.webhook_workers,
+    settings.webhook_batch_size,
+    settings.webhook_dedup_size,
+)
@@ -0,0 +1,47 @@
+import re
+import time
+from datetime import datetime, timezone
+
+def parse_datetime(value):
+    """
+    Parses Duffel's ISO 8601 timestamps ("2020-01-17T10:42:14.545Z").
+    Returns None for anything that is not a timestamp.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def seconds_until(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        return None
+    return parsed.timestamp() - time.time()
+
+_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:[\d.]+S)?)?$")
+
+def duration_minutes(value):
+    """
+    Converts an ISO 8601 duration such as "PT02H26M" or "P1DT2H" to minutes.
+    """
+    match = _DURATION.match(value) if isinstance(value, str) else None
+    if match is None:
+        return None
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    return days * 1440 + hours * 60 + minutes
+
+def minute_of_day(value):
+    """
+    Minutes since local midnight of a "YYYY-MM-DDTHH:MM:SS" timestamp.
+    """
+    if not isinstance(value, str) or len(value) < 16:
+        return None
+    try:
+        return int(value[11:13]) * 60 + int(value[14:16])
+    except ValueError:
+        return None
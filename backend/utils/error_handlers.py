@@ -1,19 +1,30 @@
+import math
 from fastapi.responses import JSONResponse
+from backend.utils.json_codec import FastJSONResponse
 from typing import Any, Dict
 
+def error_body(error: Exception) -> dict:
+    """
+    The {"message", "type", "details"} description of an exception used
+    wherever an error is reported, in a response or inside a stream.
+    """
+    return {
+        "message": str(error),
+        "type": getattr(error, "type", "server_error"),
+        "details": getattr(error, "details", None),
+    }
+
 def api_exception(error: Exception, status: int = 500) -> JSONResponse:
     """
     Converts any exception into a structured API error response.
+    Errors carrying a `status_code` (e.g. rate limiting) keep that status.
     """
-    content = {
-        "success": False,
-        "error": {
-            "message": str(error),
-            "type": getattr(error, "type", "server_error"),
-            "details": getattr(error, "details", None),
-        }
-    }
-    return JSONResponse(status_code=status, content=content)
+    status = getattr(error, "status_code", status)
+    content = {"success": False, "error": error_body(error)}
+    headers = None
+    if getattr(error, "retry_after", None) is not None:
+        headers = {"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    return FastJSONResponse(status_code=status, content=content, headers=headers)
 
 def validation_error(message: str, details: Any = None, status: int = 422) -> JSONResponse:
     """
@@ -27,4 +38,4 @@ def validation_error(message: str, details: Any = None, status: int = 422) -> JS
             "details": details,
         }
     }
-    return JSONResponse(status_code=status, content=content) 
\ No newline at end of file
+    return FastJSONResponse(status_code=status, content=content) 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import hashlib
+import json
+
+def segment_key(segment: dict) -> tuple:
+    carrier = segment.get("marketing_carrier") or {}
+    return (
+        carrier.get("iata_code"),
+        segment.get("marketing_carrier_flight_number"),
+        (segment.get("origin") or {}).get("iata_code"),
+        (segment.get("destination") or {}).get("iata_code"),
+        segment.get("departing_at"),
+    )
+
+def itinerary_key(offer: dict) -> tuple:
+    """
+    Identifies the flights an offer flies, independent of fare brand,
+    conditions or price: the ordered segments of every slice.
+    """
+    return tuple(
+        tuple(segment_key(segment) for segment in slice_.get("segments") or [])
+        for slice_ in offer.get("slices") or []
+    )
+
+def offer_amount(offer: dict) -> float:
+    try:
+        return float(offer.get("total_amount"))
+    except (TypeError, ValueError):
+        return float("inf")
+
+# Per-offer keys left out of the itinerary shared by all its fares
+_SLICE_FARE_KEYS = {"id", "fare_brand_name", "conditions"}
+_SEGMENT_FARE_KEYS = {"id", "passengers"}
+
+def itinerary_id(key: tuple) -> str:
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+
+def _shared_slice(slice_: dict) -> dict:
+    shared = {k: v for k, v in slice_.items() if k not in _SLICE_FARE_KEYS}
+    shared["segments"] = [
+        {k: v for k, v in segment.items() if k not in _SEGMENT_FARE_KEYS}
+        for segment in slice_.get("segments") or []
+    ]
+    return shared
+
+def group_by_itinerary(offers: list) -> tuple:
+    """
+    Collapses offers that fly the same segments into one itinerary node
+    with a compact list of fare variants, keeping the input order.
+    Identical conditions objects are stored once in a shared table and
+    referenced by index. Returns (itineraries, conditions).
+    """
+    groups = {}
+    conditions = []
+    condition_ids = {}
+    for offer in offers:
+        key = itinerary_key(offer)
+        node = groups.get(key)
+        if node is None:
+            node = groups[key] = {
+                "itinerary_id": itinerary_id(key),
+                "owner": offer.get("owner"),
+                "slices": [_shared_slice(s) for s in offer.get("slices") or []],
+                "fares": [],
+            }
+        canonical = json.dumps(offer.get("conditions"), sort_keys=True)
+        if canonical not in condition_ids:
+            condition_ids[canonical] = len(conditions)
+            conditions.append(offer.get("conditions"))
+        node["fares"].append({
+            "offer_id": offer.get("id"),
+            "total_amount": offer.get("total_amount"),
+            "total_currency": offer.get("total_currency"),
+            "fare_brand_names": [s.get("fare_brand_name") for s in offer.get("slices") or []],
+            "conditions": condition_ids[canonical],
+            "expires_at": offer.get("expires_at"),
+        })
+    for node in groups.values():
+        node["lowest_total_amount"] = min((f["total_amount"] for f in node["fares"]), key=lambda a: float(a or "inf"))
+    return list(groups.values()), conditions
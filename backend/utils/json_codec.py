@@ -0,0 +1,62 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+from backend.config import settings
+
+# Optional fast backends, tried in this order
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+def _backends() -> dict:
+    backends = {"stdlib": (_stdlib_dumps, json.loads)}
+    if msgspec is not None:
+        backends["msgspec"] = (msgspec.json.Encoder().encode, msgspec.json.Decoder().decode)
+    if orjson is not None:
+        backends["orjson"] = (lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), orjson.loads)
+    return backends
+
+BACKENDS = _backends()
+backend = "stdlib"
+_dumps, _loads = BACKENDS["stdlib"]
+
+def use(name: str = "auto") -> str:
+    """
+    Switches the process-wide JSON backend. "auto" picks the fastest installed one.
+    """
+    global backend, _dumps, _loads
+    if name == "auto":
+        name = next((n for n in ("orjson", "msgspec") if n in BACKENDS), "stdlib")
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not installed")
+    backend = name
+    _dumps, _loads = BACKENDS[name]
+    return name
+
+def dumps(obj: Any) -> bytes:
+    try:
+        return _dumps(obj)
+    except TypeError:
+        # Types the fast encoders refuse (e.g. Decimal) go through stdlib
+        return _stdlib_dumps(obj)
+
+def loads(data):
+    return _loads(data)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the configured fast JSON backend.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+use(settings.json_backend)
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from fastapi import Query
+
+# Shared `fields` query parameter of every endpoint that supports projection
+FIELDS_QUERY = Query(None, description="Comma-separated sparse fieldset, e.g. id,total_amount,owner.name")
+
+def _parse(fields: str) -> dict:
+    tree = {}
+    for path in fields.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for key in path.split("."):
+            node = node.setdefault(key, {})
+    return tree
+
+def _compile(tree: dict):
+    if not tree:
+        return None
+    items = [(key, _compile(subtree)) for key, subtree in tree.items()]
+
+    def apply(value):
+        if isinstance(value, list):
+            return [apply(item) for item in value]
+        if isinstance(value, dict):
+            return {
+                key: value[key] if sub is None else sub(value[key])
+                for key, sub in items if key in value
+            }
+        return value
+
+    return apply
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: str):
+    """
+    Compiles a sparse fieldset such as "id,total_amount,owner.name" into a
+    function that prunes a record (or list of records) down to those paths.
+    Lists are traversed transparently. Returns None when nothing is selected.
+    """
+    return _compile(_parse(fields))
+
+def project(result: dict, fields: str = None):
+    """
+    Applies `fields` to the records under a Duffel response's "data" key,
+    leaving "meta" alone. The input is never mutated.
+    """
+    projection = compile_fields(fields) if fields else None
+    if projection is None or not isinstance(result, dict) or "data" not in result:
+        return result
+    return {**result, "data": projection(result["data"])}
+
+async def project_stream(records, fields: str = None):
+    projection = compile_fields(fields) if fields else None
+    try:
+        async for record in records:
+            yield record if projection is None else projection(record)
+    finally:
+        await records.aclose()
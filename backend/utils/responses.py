@@ -0,0 +1,9 @@
+from typing import Any
+from backend.utils.json_codec import FastJSONResponse
+
+def api_response(data: Any, status: int = 200) -> FastJSONResponse:
+    """
+    Builds the success envelope directly, skipping FastAPI's
+    jsonable_encoder pass over payloads that are already plain JSON.
+    """
+    return FastJSONResponse(status_code=status, content={"success": True, "data": data})
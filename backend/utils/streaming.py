@@ -0,0 +1,77 @@
+from fastapi.responses import StreamingResponse
+from backend.services.duffel_client import duffel
+from backend.utils import json_codec
+from backend.utils.error_handlers import error_body
+
+def _error_line(error: Exception) -> bytes:
+    return json_codec.dumps({"success": False, "error": error_body(error)}) + b"\n"
+
+async def ndjson_response(records) -> StreamingResponse:
+    """
+    Streams an async iterator of records as newline-delimited JSON.
+    The first record is awaited up front so upstream errors still surface
+    as a normal error response instead of a truncated 200.
+    """
+    try:
+        first = await records.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def body():
+        if first is None:
+            return
+        yield json_codec.dumps(first) + b"\n"
+        try:
+            async for record in records:
+                yield json_codec.dumps(record) + b"\n"
+        except Exception as e:
+            yield _error_line(e)
+        finally:
+            await records.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+# The success envelope every router returns, split around the upstream body
+ENVELOPE_PREFIX = b'{"success":true,"data":'
+ENVELOPE_SUFFIX = b"}"
+
+def passthrough_response(upstream) -> StreamingResponse:
+    """
+    Wraps an open upstream response in the success envelope and streams
+    its bytes through untouched, without materializing the JSON.
+    """
+    async def body():
+        decoded = 0
+        try:
+            yield ENVELOPE_PREFIX
+            async for chunk in upstream.aiter_bytes():
+                decoded += len(chunk)
+                yield chunk
+            yield ENVELOPE_SUFFIX
+        finally:
+            await upstream.aclose()
+            duffel.record_transfer(upstream, decoded)
+
+    return StreamingResponse(body(), media_type="application/json")
+
+async def forward_raw(request, path: str) -> StreamingResponse:
+    """
+    POSTs the incoming body to `path` as raw bytes and streams Duffel's
+    reply back. Duffel validates the body itself, so it is never parsed.
+    """
+    body = await request.body() or b"{}"
+    upstream = await duffel.stream("POST", path, content=body)
+    return passthrough_response(upstream)
+
+def sse_event(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + json_codec.dumps(data) + b"\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Streams an async iterator of already-encoded server-sent events.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
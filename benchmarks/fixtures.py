@@ -0,0 +1,166 @@
+"""
+Synthetic Duffel-shaped payloads for the benchmarks in this directory.
+"""
+import random
+
+AIRPORTS = ["JFK", "LHR", "CDG", "AMS", "FRA", "DXB", "SIN", "HND", "LAX", "ORD"]
+AIRLINES = [("BA", "British Airways"), ("AA", "American Airlines"), ("AF", "Air France"),
+            ("KL", "KLM"), ("LH", "Lufthansa"), ("EK", "Emirates")]
+AIRCRAFT = [("789", "Boeing 787-9"), ("77W", "Boeing 777-300ER"), ("359", "Airbus A350-900")]
+BRANDS = ["Basic", "Standard", "Flex", "Business Saver"]
+SEAT_PRICES = ["0.00", "18.00", "25.00", "45.00"]
+
+def airport(code):
+    return {
+        "id": f"arp_{code.lower()}_gb",
+        "type": "airport",
+        "iata_code": code,
+        "icao_code": f"E{code}",
+        "name": f"{code} International Airport",
+        "city_name": f"City {code}",
+        "iata_city_code": code,
+        "iata_country_code": "GB",
+        "latitude": 51.47,
+        "longitude": -0.45,
+        "time_zone": "Europe/London",
+        "city": {"id": f"cit_{code.lower()}_gb", "name": f"City {code}", "iata_code": code, "iata_country_code": "GB", "type": "city"},
+    }
+
+def airline(code, name):
+    return {
+        "id": f"arl_{code.lower()}",
+        "iata_code": code,
+        "name": name,
+        "logo_symbol_url": f"https://assets.duffel.com/img/airlines/for-light-background/full-color-logo/{code}.svg",
+        "logo_lockup_url": f"https://assets.duffel.com/img/airlines/for-light-background/full-color-lockup/{code}.svg",
+        "conditions_of_carriage_url": f"https://www.example.com/{code}/conditions",
+    }
+
+def segment(rng, origin, destination, day, carrier, passenger_ids):
+    hour = rng.randint(0, 20)
+    aircraft = rng.choice(AIRCRAFT)
+    return {
+        "id": f"seg_{rng.getrandbits(48):012x}",
+        "origin": airport(origin),
+        "destination": airport(destination),
+        "departing_at": f"2025-12-{day:02d}T{hour:02d}:15:00",
+        "arriving_at": f"2025-12-{day:02d}T{hour + 3:02d}:40:00",
+        "duration": "PT03H25M",
+        "marketing_carrier": airline(*carrier),
+        "operating_carrier": airline(*carrier),
+        "marketing_carrier_flight_number": str(rng.randint(1, 999)),
+        "operating_carrier_flight_number": str(rng.randint(1, 999)),
+        "aircraft": {"id": f"arc_{aircraft[0].lower()}", "iata_code": aircraft[0], "name": aircraft[1]},
+        "distance": "5540.1",
+        "passengers": [
+            {
+                "passenger_id": pid,
+                "cabin_class": "economy",
+                "cabin_class_marketing_name": "Economy",
+                "fare_basis_code": "Y20LGTN2",
+                "baggages": [{"type": "checked", "quantity": 1}, {"type": "carry_on", "quantity": 1}],
+            }
+            for pid in passenger_ids
+        ],
+    }
+
+def offer(rng, index, passenger_ids=("pas_0001", "pas_0002")):
+    carrier = rng.choice(AIRLINES)
+    origin, via, destination = rng.sample(AIRPORTS, 3)
+    stops = rng.choice([0, 0, 1])
+    slices = []
+    for day, (a, b) in ((1, (origin, destination)), (8, (destination, origin))):
+        legs = [(a, b)] if stops == 0 else [(a, via), (via, b)]
+        slices.append({
+            "id": f"sli_{rng.getrandbits(48):012x}",
+            "origin": airport(a),
+            "destination": airport(b),
+            "duration": "PT07H10M" if stops else "PT03H25M",
+            "fare_brand_name": rng.choice(BRANDS),
+            "segments": [segment(rng, x, y, day, carrier, passenger_ids) for x, y in legs],
+            "conditions": {"change_before_departure": {"allowed": True, "penalty_amount": "50.00", "penalty_currency": "GBP"}},
+        })
+    total = rng.randint(9000, 250000) / 100
+    return {
+        "id": f"off_{index:04d}{rng.getrandbits(48):012x}",
+        "live_mode": False,
+        "created_at": "2025-11-01T10:00:00.000000Z",
+        "updated_at": "2025-11-01T10:00:00.000000Z",
+        "expires_at": "2099-11-01T10:30:00.000000Z",
+        "total_amount": f"{total:.2f}",
+        "total_currency": "GBP",
+        "base_amount": f"{total * 0.8:.2f}",
+        "base_currency": "GBP",
+        "tax_amount": f"{total * 0.2:.2f}",
+        "tax_currency": "GBP",
+        "total_emissions_kg": str(rng.randint(200, 900)),
+        "owner": airline(*carrier),
+        "slices": slices,
+        "passengers": [{"id": pid, "type": "adult"} for pid in passenger_ids],
+        "passenger_identity_documents_required": False,
+        "payment_requirements": {
+            "requires_instant_payment": False,
+            "price_guarantee_expires_at": "2099-11-03T10:00:00Z",
+            "payment_required_by": "2099-11-03T10:00:00Z",
+        },
+        "conditions": {
+            "refund_before_departure": {"allowed": rng.random() < 0.5, "penalty_amount": "100.00", "penalty_currency": "GBP"},
+            "change_before_departure": {"allowed": True, "penalty_amount": "50.00", "penalty_currency": "GBP"},
+        },
+        "available_services": None,
+    }
+
+def offers(count=200, seed=7):
+    rng = random.Random(seed)
+    return [offer(rng, i) for i in range(count)]
+
+def offer_request(count=200, seed=7):
+    return {"data": {"id": "orq_0000AbCdEf", "cabin_class": "economy", "offers": offers(count, seed)}}
+
+def seat_maps(segments=2, rows=40, layout=("ABC", "DEFG", "HJK"), passenger_ids=("pas_0001", "pas_0002"), seed=7,
+              mixed_prices=False):
+    """
+    With `mixed_prices` each passenger gets their own price for a seat, as
+    Duffel does for e.g. child fares; otherwise all passengers pay the same.
+    """
+    rng = random.Random(seed)
+    maps = []
+    for s in range(segments):
+        cabin_rows = []
+        for row in range(1, rows + 1):
+            sections = []
+            for letters in layout:
+                elements = []
+                for letter in letters:
+                    taken = rng.random() < 0.4
+                    price = rng.choice(SEAT_PRICES)
+                    elements.append({
+                        "type": "seat",
+                        "designator": f"{row}{letter}",
+                        "name": "Exit row seat" if row in (12, 13) else None,
+                        "disclosures": ["Do not seat children in exit row seats"] if row in (12, 13) else [],
+                        "available_services": [] if taken else [
+                            {
+                                "id": f"ase_{rng.getrandbits(48):012x}",
+                                "passenger_id": pid,
+                                "total_amount": rng.choice(SEAT_PRICES) if mixed_prices else price,
+                                "total_currency": "GBP",
+                            }
+                            for pid in passenger_ids
+                        ],
+                    })
+                sections.append({"elements": elements})
+            cabin_rows.append({"sections": sections})
+        maps.append({
+            "id": f"sea_{s:04d}",
+            "segment_id": f"seg_{s:04d}",
+            "slice_id": f"sli_{s // 2:04d}",
+            "cabins": [{
+                "cabin_class": "economy",
+                "deck": 0,
+                "aisles": len(layout) - 1,
+                "wings": {"first_row_index": 10, "last_row_index": 20},
+                "rows": cabin_rows,
+            }],
+        })
+    return {"data": maps}
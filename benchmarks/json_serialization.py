@@ -0,0 +1,62 @@
+"""
+Share of gateway request time spent on JSON (de)serialization, per backend.
+
+Runs a parsed proxy route in-process against a canned upstream response:
+
+    python -m benchmarks.json_serialization [offers] [rounds]
+"""
+import asyncio
+import sys
+import time
+import httpx
+from fastapi.encoders import jsonable_encoder
+from backend.main import app
+from backend.services import duffel_client
+from backend.utils import json_codec
+from benchmarks.fixtures import offer_request
+
+async def run(backend: str, body: bytes, rounds: int):
+    json_codec.use(backend)
+
+    decode = encode = jsonable = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = json_codec.loads(body)
+        decoded = time.perf_counter()
+        json_codec.dumps({"success": True, "data": result})
+        decode += decoded - started
+        encode += time.perf_counter() - decoded
+    for _ in range(rounds):
+        started = time.perf_counter()
+        jsonable_encoder({"success": True, "data": result})
+        jsonable += time.perf_counter() - started
+    serialization = decode + encode
+
+    upstream = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    duffel_client._http_client = httpx.AsyncClient(transport=upstream, base_url="https://api.duffel.com")
+    gateway = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+    await gateway.get("/api/orders/ord_warmup")
+    total = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        r = await gateway.get("/api/orders/ord_benchmark")
+        r.raise_for_status()
+        total += time.perf_counter() - started
+    await gateway.aclose()
+    await duffel_client.close_http_client()
+
+    ms = lambda seconds: f"{seconds / rounds * 1000:8.2f} ms"
+    print(f"{backend:>8}: request {ms(total)}   decode {ms(decode)}   encode {ms(encode)}   "
+          f"serialization share {serialization / total:6.1%}   "
+          f"(jsonable_encoder pass, now skipped: {ms(jsonable)})")
+
+def main():
+    offers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    body = json_codec.BACKENDS["stdlib"][0](offer_request(offers))
+    print(f"payload: {offers} offers, {len(body) / 1024:.0f} KiB")
+    for backend in json_codec.BACKENDS:
+        asyncio.run(run(backend, body, rounds))
+
+if __name__ == "__main__":
+    main()
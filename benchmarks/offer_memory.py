@@ -0,0 +1,57 @@
+"""
+Memory held by a search's offers as parsed JSON dicts vs CompactOffer.
+
+    python -m benchmarks.offer_memory [offers] [searches]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from backend.models.compact import CompactOffer, interner
+from benchmarks.fixtures import offers
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, current
+
+def check_round_trip(offer: dict):
+    """
+    CompactOffer must rebuild the payload exactly, including the null and
+    missing amounts and slices Duffel sends for some offers.
+    """
+    variants = [offer]
+    for key in ("base_amount", "tax_amount", "slices"):
+        variants.append({**offer, key: None})
+        variants.append({k: v for k, v in offer.items() if k != key})
+    first = offer["slices"][0]
+    variants.append({**offer, "slices": [{**first, "segments": None}]})
+    variants.append({**offer, "slices": [{k: v for k, v in first.items() if k != "segments"}]})
+    for variant in variants:
+        assert CompactOffer(variant).to_dict() == variant, "CompactOffer must round-trip"
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    searches = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Each search arrives as its own JSON body, like an upstream response
+    bodies = [json.dumps(offers(count, seed)).encode() for seed in range(searches)]
+
+    raw, raw_bytes = measure(lambda: [json.loads(body) for body in bodies])
+    compact, compact_bytes = measure(
+        lambda: [[CompactOffer(o) for o in json.loads(body)] for body in bodies]
+    )
+
+    assert all(o.to_dict() == r for o, r in zip(compact[0], raw[0])), "CompactOffer must round-trip"
+    check_round_trip(raw[0][0])
+    total = count * searches
+    print(f"{searches} searches x {count} offers")
+    print(f"  raw dicts:     {raw_bytes / 2**20:8.2f} MiB  ({raw_bytes / total:7.0f} B/offer)")
+    print(f"  CompactOffer:  {compact_bytes / 2**20:8.2f} MiB  ({compact_bytes / total:7.0f} B/offer)")
+    print(f"  saved:         {1 - compact_bytes / raw_bytes:8.1%}")
+    print(f"  interner:      {interner.stats()}")
+
+if __name__ == "__main__":
+    main()
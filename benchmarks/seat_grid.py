@@ -0,0 +1,65 @@
+"""
+Size and query latency of the compact seat grid vs walking the raw payload.
+
+    python -m benchmarks.seat_grid [segments] [rows]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from backend.models.seat_grid import SeatGrid
+from benchmarks.fixtures import seat_maps
+
+def walk_raw(payload, passenger_id, max_price):
+    # What a client does today to find the seats it can offer
+    seats = []
+    for seat_map in payload["data"]:
+        for cabin in seat_map["cabins"]:
+            for row in cabin["rows"]:
+                for section in row["sections"]:
+                    for element in section["elements"]:
+                        for service in element.get("available_services") or []:
+                            if service["passenger_id"] == passenger_id and float(service["total_amount"]) <= max_price:
+                                seats.append(element["designator"])
+    return seats
+
+def allocated(build):
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, current
+
+def timed(fn, rounds=200):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+def main():
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    body = json.dumps(seat_maps(segments, rows)).encode()
+
+    raw, raw_bytes = allocated(lambda: json.loads(body))
+    grid, grid_bytes = allocated(lambda: SeatGrid.from_seat_maps(json.loads(body)["data"]))
+
+    from_raw = walk_raw(raw, "pas_0001", 25.0)
+    from_grid = [s["designator"] for c in grid.available("pas_0001", max_price=25.0) for s in c["seats"]]
+    assert from_raw == from_grid, "grid and raw walk must agree"
+    # Passengers priced differently for the same seat must each see their own price
+    mixed = seat_maps(segments, rows, mixed_prices=True)
+    mixed_grid = SeatGrid.from_seat_maps(mixed["data"])
+    for passenger_id in ("pas_0001", "pas_0002"):
+        seats = [s["designator"] for c in mixed_grid.available(passenger_id, max_price=25.0) for s in c["seats"]]
+        assert walk_raw(mixed, passenger_id, 25.0) == seats, "per-passenger seat prices must agree"
+
+    print(f"{segments} segments x {rows} rows, JSON body {len(body) / 1024:.0f} KiB")
+    print(f"  raw payload:  {raw_bytes / 1024:8.0f} KiB in memory   query {timed(lambda: walk_raw(raw, 'pas_0001', 25.0)):8.1f} us")
+    print(f"  seat grid:    {grid_bytes / 1024:8.0f} KiB in memory   query {timed(lambda: grid.available('pas_0001', max_price=25.0)):8.1f} us")
+    print(f"  response:     {len(json.dumps(grid.available('pas_0001', max_price=25.0))) / 1024:8.0f} KiB for {len(from_grid)} seats")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,12 @@ API_BASE = st.sidebar.text_input("API Base URL", "http://localhost:8000/api")
 
 st.title("Duffel Booking Workflow")
 
+# Only what Steps 2-3 read from each offer; the gateway prunes the rest
+OFFER_LIST_FIELDS = ",".join([
+    "id", "owner.name", "owner.iata_code", "total_amount", "total_currency",
+    "payment_requirements", "passengers",
+])
+
 # --- Helper Functions ---
 def get_offer_label(offer):
     if not isinstance(offer, dict):
@@ -79,7 +85,8 @@ with st.form("offer_request_form"):
             "max_connections": max_connections
         }
         with st.spinner("Searching for flights..."):
-            resp = requests.post(f"{API_BASE}/offer-requests", json=offer_req)
+            previous = (st.session_state.offer_request or {}).get("id")
+            resp = requests.post(f"{API_BASE}/offer-requests", json=offer_req, params={"replaces": previous} if previous else None)
             if resp.status_code == 200:
                 data = resp.json()
                 if data.get("success"):
@@ -111,7 +118,7 @@ if st.session_state.offer_request:
     if st.session_state.offers is None:
         offer_req_id = st.session_state.offer_request.get("id")
         with st.spinner("Fetching offers..."):
-            resp = requests.get(f"{API_BASE}/offers", params={"offer_request_id": offer_req_id, "limit": 10})
+            resp = requests.get(f"{API_BASE}/offers", params={"offer_request_id": offer_req_id, "limit": 10, "fields": OFFER_LIST_FIELDS})
             if resp.status_code == 200:
                 data = resp.json()
                 raw_offers = data.get("data", {}).get("offers", []) or data.get("data", {}).get("data", []) or []
@@ -266,13 +273,19 @@ if st.session_state.selected_offer:
                 order_body["payments"] = payment_payload_list
             
             with st.spinner(f"Creating {api_order_type} order..."):
-                resp = requests.post(f"{API_BASE}/orders", json=order_body)
+                if is_instant:
+                    # Order, payment and ticketing in one call; returns once documents are issued
+                    resp = requests.post(f"{API_BASE}/bookings", params={"stream": "false"}, json={"order": order_body, "timeout": 20})
+                else:
+                    resp = requests.post(f"{API_BASE}/orders", json=order_body)
                 
                 # Handle Response
                 if resp.status_code in [200, 201]:
                     data = resp.json()
                     if data.get("success"):
                         order_data = data["data"]["data"]
+                        if is_instant:
+                            order_data = order_data["order"]
                         st.session_state.order = order_data
                         
                         ref = order_data.get('booking_reference')
@@ -357,8 +370,8 @@ if st.session_state.order:
                         st.session_state.payment_response = data["data"]
                         
                         # --- FIX: REFRESH ORDER LOGIC ---
-                        # Fetch the updated order to get the new 'documents' and 'payment_status'
-                        refresh_resp = requests.get(f"{API_BASE}/orders/{order_id}")
+                        # Hold until the gateway sees the documents issued (or the wait runs out)
+                        refresh_resp = requests.get(f"{API_BASE}/orders/{order_id}/wait", params={"until": "documents_issued", "timeout": 20})
                         if refresh_resp.status_code == 200:
                             updated_order = refresh_resp.json()["data"]["data"]
                             st.session_state.order = updated_order
@@ -415,7 +428,7 @@ if st.session_state.order and st.session_state.order.get("payment_status", {}).g
         st.warning("No documents found yet. The airline might still be issuing them.")
         if st.button("🔄 Refresh Documents"):
             with st.spinner("Fetching official documents..."):
-                resp = requests.get(f"{API_BASE}/orders/{order_id}")
+                resp = requests.get(f"{API_BASE}/orders/{order_id}/wait", params={"until": "documents_issued", "timeout": 30})
                 if resp.status_code == 200:
                     data = resp.json()
                     st.session_state.order = data["data"]["data"]